@@ -1,10 +1,62 @@
 import networkx as nx
+from collections import OrderedDict
 from FAdo.reex import *
 from FAdo.fio import *
 
 
+class RegexCache:
+
+    def __init__(self, maxsize=128):
+        """Initialize a bounded LRU cache for compiled regular expressions.
+        Parameters:
+        maxsize : int, optional (default = 128; maximum number of cached regular expressions)"""
+
+        self.maxsize = maxsize
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, regex_str):
+        """Looks up compiled regular expression and marks it as most recently used.
+        Parameters:
+        regex_str : string (String representing regular expression)
+
+        Returns:
+        entry : tuple (minimal DFA and label-indexed transition table) or None"""
+
+        if regex_str not in self.entries:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        entry = self.entries.pop(regex_str)
+        self.entries[regex_str] = entry
+        return entry
+
+    def put(self, regex_str, entry):
+        """Stores compiled regular expression, evicting the least recently used one if the cache is full.
+        Parameters:
+        regex_str : string (String representing regular expression)
+        entry : tuple (minimal DFA and label-indexed transition table)"""
+
+        if regex_str in self.entries:
+            self.entries.pop(regex_str)
+        elif len(self.entries) >= self.maxsize:
+            self.entries.popitem(last=False)
+        self.entries[regex_str] = entry
+
+    def clear(self):
+        """Removes all entries and resets the hit and miss counters."""
+
+        self.entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+
 class Automaton:
 
+    regex_cache = RegexCache()
+
     @staticmethod
     def graph_to_automaton(G, sources, targets):
         """Covert graph G to equivalent NFA.
@@ -78,18 +130,48 @@ class Automaton:
 
     @staticmethod
     def regex_to_automaton(regex_str):
-        """Covert graph G to equivalent NFA.
+        """Compute minimal DFA for regular expression.
+        The DFA is copied from Automaton.regex_cache, so callers may modify it.
+        Parameters:
+        regex_str : string (String representing regular expression)
+
+        Returns:
+        automaton : FAdo DFA (minimal DFA for regular expression regex_str)"""
+
+        (automaton, table) = Automaton.compile_regex(regex_str)
+
+        return automaton.dup()
+
+    @staticmethod
+    def compile_regex(regex_str):
+        """Compute minimal DFA and label-indexed transition table for regular expression.
+        Results are kept in Automaton.regex_cache, so repeated regular expressions skip the DFA construction.
+        The returned DFA and table are shared between calls and must not be modified.
         Parameters:
         regex_str : string (String representing regular expression)
 
         Returns:
-        automaton : FAdo NFA (NFA for regular expression regex_str)"""
+        automaton : FAdo DFA (minimal DFA for regular expression regex_str)
+        table : dictionary (table[symbol][state] is the successor state or -1 if there is none)"""
+
+        entry = Automaton.regex_cache.get(regex_str)
+        if entry is not None:
+            return entry
 
         regex = str2regexp(regex_str)
         automaton = regex.nfaPosition().toDFA().minimal(complete=False)
         automaton.renameStates(range(0, len(automaton.States)))
 
-        return automaton
+        table = dict()
+        for u in automaton.delta:
+            for symbol in automaton.delta[u]:
+                if symbol not in table:
+                    table[symbol] = [-1] * len(automaton.States)
+                table[symbol][u] = automaton.delta[u][symbol]
+
+        entry = (automaton, table)
+        Automaton.regex_cache.put(regex_str, entry)
+        return entry
 
     @staticmethod
     def product_automaton(weighted_automaton, other_automaton):
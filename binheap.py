@@ -72,6 +72,13 @@ class BinHeap:
             else:
                 return i * 2 + 1
     
+    def findMin(self):
+        """Computes element with minimum key value without removing it
+        Returns:
+        min : (element with min key value)"""
+
+        return self.heapList[1]
+
     def extractMin(self):
         """Computes element i with minimum key value
         Returns:
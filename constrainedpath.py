@@ -1,8 +1,12 @@
 import networkx as nx
 import time
-from automaton import Automaton
-from shortestpath import Dijkstra
-from FAdo.cfg import *
+import heapq
+import itertools
+import multiprocessing
+import numpy as np
+from array import array
+from automaton import Automaton, RegexCache
+from shortestpath import Dijkstra, DAGraph
 from binheap import BinHeap
 from grammarhelper import GrammarHelper
 from graph import GraphHelper
@@ -11,7 +15,7 @@ from graph import GraphHelper
 class REGLanguage:
 
     @staticmethod
-    def st_reg_shortest_path__product_nfa(G, source, target, regex_str, timeit=False):
+    def st_reg_shortest_path__product_nfa(G, source, target, regex_str, timeit=False, queue=BinHeap):
         """Compute regular language constrained shortest path from source to target in the graph.
         Parameters:
         G : NetworkX graph
@@ -19,6 +23,7 @@ class REGLanguage:
         target : node (Ending node for path)
         regex_str : string (String that specifies regular expression/language)
         timeit : bool, optional (default = False; If True running time is returned)
+        queue : class, optional (default = BinHeap; priority queue used to select the next product state)
 
         Returns:
         dist : int (The length of the shortest path)
@@ -39,7 +44,7 @@ class REGLanguage:
         t1 = time.clock()
         MG = Automaton.graph_to_automaton(G, [source], [target])
         t2 = time.clock()
-        MR = Automaton.regex_to_automaton(regex_str)
+        (MR, table) = Automaton.compile_regex(regex_str)
         t3 = time.clock()
         MP = Automaton.product_automaton(MG, MR)
         t4 = time.clock()
@@ -62,15 +67,11 @@ class REGLanguage:
 
         t5 = time.clock()
         sourceP = sourcesP[0]
-        for targetP in targetsP:
-            try:
-                (current_dist, current_path) = Dijkstra.st_shortest_path_heap(GP, sourceP, targetP)
-                path_found = 1
-                if current_dist < dist:
-                    dist = current_dist
-                    path = current_path[:]
-            except nx.NetworkXNoPath:
-                pass
+        try:
+            (dist, path) = Dijkstra.st_shortest_path_heap__targets(GP, sourceP, targetsP, queue)
+            path_found = 1
+        except nx.NetworkXNoPath:
+            pass
         t6 = time.clock()
 
         if path_found:
@@ -88,7 +89,7 @@ class REGLanguage:
             raise nx.NetworkXNoPath("No path between %s and %s." % (source, target))
 
     @staticmethod
-    def st_reg_shortest_path(G, source, target, regex_str, timeit=False):
+    def st_reg_shortest_path(G, source, target, regex_str, timeit=False, queue=BinHeap):
         """Compute regular language constrained shortest path from source to target in the graph.
         Parameters:
         G : NetworkX graph
@@ -96,6 +97,7 @@ class REGLanguage:
         target : node (Ending node for path)
         regex_str : string (String that specifies regular expression/language)
         timeit : bool, optional (default = False; If True running time is returned)
+        queue : class, optional (default = BinHeap; priority queue used to select the next product state)
 
         Returns:
         dist : int (The length of the shortest path)
@@ -113,86 +115,397 @@ class REGLanguage:
                 return 0, [source], times
 
         t1 = time.clock()
-        MR = Automaton.regex_to_automaton(regex_str)
-        (R, sourceR, targetsR) = Automaton.automaton_to_graph(MR)
+        (MR, table) = Automaton.compile_regex(regex_str)
         t2 = time.clock()
 
-        nodesG = set(nx.nodes(G))
-        nodesR = set(nx.nodes(R))
+        sourceP = (source, MR.Initial)
+        targetsP = set([(target, targetR) for targetR in MR.Final])
+
+        t3 = time.clock()
+        outgoing_edgesG = GraphHelper.get_label_index(G).successors
+        t4 = time.clock()
+
+        path_found = 0
+        path = []
+        dist = float('inf')
+
+        heap = queue()
+        heap.insert(sourceP, 0)
+        pred = dict()
+
+        while heap.currentSize > 0:
+            min_node = heap.extractMin()
+            if min_node in targetsP:
+                path_found = 1
+                node = min_node
+                while True:
+                    path[:0] = [node[0]]
+                    if node == sourceP:
+                        break
+                    node = pred[node]
+                dist = heap.key[min_node]
+                break
+
+            current_weight = heap.key[min_node]
+
+            (u, q) = min_node
+            labelsG = outgoing_edgesG[u]
+
+            for symbol in labelsG:
+                row = table.get(symbol)
+                if row is None or row[q] == -1:
+                    continue
+                for x in labelsG[symbol]:
+                    node = (x, row[q])
+                    weight = current_weight + G[u][x]['weight']
+                    if node not in heap.key:
+                        heap.insert(node, weight)
+                        pred[node] = min_node
+                    elif weight < heap.key[node]:
+                        heap.decreaseKey(node, weight)
+                        pred[node] = min_node
+        t5 = time.clock()
+
+        if path_found:
+            if not timeit:
+                return dist, path
+            else:
+                times = dict()
+                times['regex_to_nfa'] = t2 - t1
+                times['setup_pointers'] = t4 - t3
+                times['calculate_path'] = t5 - t4
+                return dist, path, times
+        else:
+            raise nx.NetworkXNoPath("No path between %s and %s." % (source, target))
+
 
-        sourceP = (source, sourceR)
-        targetsP = [(target, targetR) for targetR in targetsR]
+    @staticmethod
+    def st_reg_shortest_path__encoded(G, source, target, regex_str, timeit=False):
+        """Compute regular language constrained shortest path from source to target in the graph.
+        Product states (node, state) are encoded as integers node_index * |Q| + state and distances and
+        predecessors are kept in flat arrays instead of dictionaries keyed by tuples.
+        Parameters:
+        G : NetworkX graph
+        source : node (Starting node for path)
+        target : node (Ending node for path)
+        regex_str : string (String that specifies regular expression/language)
+        timeit : bool, optional (default = False; If True running time is returned)
 
-        pairs = set([(x, y) for x in nodesG for y in nodesR])
+        Returns:
+        dist : int (The length of the shortest path)
+        path : list (A list of nodes in the shortest path)
+        times : dictionary (A dictionary where running times are stored)"""
+
+        if source == target:
+            if not timeit:
+                return 0, [source]
+            else:
+                times = dict()
+                times['regex_to_nfa'] = 0.0
+                times['setup_pointers'] = 0.0
+                times['calculate_path'] = 0.0
+                return 0, [source], times
+
+        t1 = time.clock()
+        (MR, table) = Automaton.compile_regex(regex_str)
+        t2 = time.clock()
+
+        n_states = len(MR.States)
+        finals = set(MR.Final)
 
         t3 = time.clock()
-        outgoing_edgesG = dict()
-        for node in G.nodes():
-            outgoing_edgesG[node] = dict()
+        nodes = G.nodes()
+        index = dict()
+        for i, node in enumerate(nodes):
+            index[node] = i
+
+        outgoing_edgesG = []
+        for node in nodes:
+            edges = []
             for successor in G.successors(node):
-                symbol = G[node][successor]['label']
-                if symbol not in outgoing_edgesG[node]:
-                    outgoing_edgesG[node][symbol] = set()
-                outgoing_edgesG[node][symbol].add(successor)
-
-        outgoing_edgesR = dict()
-        for node in R.nodes():
-            outgoing_edgesR[node] = dict()
-            for successor in R.successors(node):
-                symbol = R[node][successor]['label']
-                if symbol not in outgoing_edgesR[node]:
-                    outgoing_edgesR[node][symbol] = set()
-                outgoing_edgesR[node][symbol].add(successor)
+                edges.append((index[successor], G[node][successor]['label'], G[node][successor]['weight']))
+            outgoing_edgesG.append(edges)
+
+        size = len(nodes) * n_states
+        dist = array('d', [float('inf')]) * size
+        pred = array('l', [-1]) * size
         t4 = time.clock()
 
+        sourceP = index[source] * n_states + MR.Initial
+        target_index = index[target]
+
         path_found = 0
         path = []
-        dist = float('inf')
-        for targetP in targetsP:
-            nodes = set(pairs)
-            heap = BinHeap()
-            heap.insert(sourceP, 0)
-            pred = dict()
-
-            while heap.currentSize > 0:
-                min_node = heap.extractMin()
-                if min_node == targetP:
-                    path_found = 1
-                    way = []
-                    node = targetP
-                    while True:
-                        way[:0] = [node[0]]
-                        if node == sourceP:
-                            break
-                        node = pred[node]
-                    current_dist = heap.key[targetP]
-                    current_path = way[:]
-                    break
+        distance = float('inf')
+
+        dist[sourceP] = 0
+        heap = [(0, sourceP)]
+
+        while heap:
+            (current_weight, min_node) = heapq.heappop(heap)
+            if current_weight > dist[min_node]:
+                continue
+
+            (u, q) = divmod(min_node, n_states)
+            if u == target_index and q in finals:
+                path_found = 1
+                distance = current_weight
+                node = min_node
+                while node != -1:
+                    path[:0] = [nodes[node // n_states]]
+                    node = pred[node]
+                break
+
+            for v, symbol, w in outgoing_edgesG[u]:
+                if symbol in table and table[symbol][q] != -1:
+                    node = v * n_states + table[symbol][q]
+                    weight = current_weight + w
+                    if weight < dist[node]:
+                        dist[node] = weight
+                        pred[node] = min_node
+                        heapq.heappush(heap, (weight, node))
+        t5 = time.clock()
+
+        if path_found:
+            if not timeit:
+                return distance, path
+            else:
+                times = dict()
+                times['regex_to_nfa'] = t2 - t1
+                times['setup_pointers'] = t4 - t3
+                times['calculate_path'] = t5 - t4
+                return distance, path, times
+        else:
+            raise nx.NetworkXNoPath("No path between %s and %s." % (source, target))
+
+
+
+    @staticmethod
+    def st_reg_shortest_path__astar(G, source, target, regex_str, heuristic, timeit=False, queue=BinHeap):
+        """Compute regular language constrained shortest path from source to target in the graph using A* search
+        on the product graph. The heuristic only looks at the node of a product state and has to be a consistent
+        lower bound on the distance to the target, e.g. GraphHelper.get_euclidean_heuristic. Product states with
+        infinite bound are never queued.
+        Parameters:
+        G : NetworkX graph
+        source : node (Starting node for path)
+        target : node (Ending node for path)
+        regex_str : string (String that specifies regular expression/language)
+        heuristic : function (lower bound for the distance from a node to target)
+        timeit : bool, optional (default = False; If True running time is returned)
+        queue : class, optional (default = BinHeap; priority queue used to select the next product state)
+
+        Returns:
+        dist : int (The length of the shortest path)
+        path : list (A list of nodes in the shortest path)
+        times : dictionary (A dictionary where running times are stored)"""
+
+        if source == target:
+            if not timeit:
+                return 0, [source]
+            else:
+                times = dict()
+                times['regex_to_nfa'] = 0.0
+                times['setup_pointers'] = 0.0
+                times['calculate_path'] = 0.0
+                return 0, [source], times
 
-                nodes.remove(min_node)
-                current_weight = heap.key[min_node]
-
-                labelsG = outgoing_edgesG[min_node[0]]
-                labelsR = outgoing_edgesR[min_node[1]]
-                labels_of_interest = filter((lambda x: x in labelsG), labelsR.keys())
-
-                for symbol in labels_of_interest:
-                    successors = [(x, y) for x in labelsG[symbol] for y in labelsR[symbol]]
-                    for node in successors:
-                        weight = current_weight + G[min_node[0]][node[0]]['weight']
-                        if node not in heap.key:
-                            heap.insert(node, weight)
-                            pred[node] = min_node
-                        elif weight < heap.key[node]:
-                            heap.decreaseKey(node, weight)
-                            pred[node] = min_node
-
-            if path_found and current_dist < dist:
-                dist = current_dist
-                path = current_path[:]
+        t1 = time.clock()
+        (MR, table) = Automaton.compile_regex(regex_str)
+        t2 = time.clock()
+
+        t3 = time.clock()
+        outgoing_edgesG = GraphHelper.get_label_index(G).successors
+        t4 = time.clock()
+
+        sourceP = (source, MR.Initial)
+        targetsP = set([(target, state) for state in MR.Final])
+
+        path_found = 0
+        path = []
+        distance = float('inf')
+
+        heap = queue()
+        heap.insert(sourceP, heuristic(source))
+        dist = {sourceP: 0}
+        pred = dict()
+
+        while heap.currentSize > 0:
+            min_node = heap.extractMin()
+            if min_node in targetsP:
+                path_found = 1
+                node = min_node
+                while True:
+                    path[:0] = [node[0]]
+                    if node == sourceP:
+                        break
+                    node = pred[node]
+                distance = dist[min_node]
+                break
+
+            current_weight = dist[min_node]
+            (u, q) = min_node
+
+            for symbol in outgoing_edgesG[u]:
+                if symbol not in table or table[symbol][q] == -1:
+                    continue
+                next_state = table[symbol][q]
+                for v in outgoing_edgesG[u][symbol]:
+                    node = (v, next_state)
+                    weight = current_weight + G[u][v]['weight']
+                    if node not in heap.key:
+                        estimate = heuristic(v)
+                        if estimate == float('inf'):
+                            continue
+                        dist[node] = weight
+                        heap.insert(node, weight + estimate)
+                        pred[node] = min_node
+                    elif weight < dist[node]:
+                        dist[node] = weight
+                        heap.decreaseKey(node, weight + heuristic(v))
+                        pred[node] = min_node
         t5 = time.clock()
 
         if path_found:
+            if not timeit:
+                return distance, path
+            else:
+                times = dict()
+                times['regex_to_nfa'] = t2 - t1
+                times['setup_pointers'] = t4 - t3
+                times['calculate_path'] = t5 - t4
+                return distance, path, times
+        else:
+            raise nx.NetworkXNoPath("No path between %s and %s." % (source, target))
+
+    @staticmethod
+    def st_reg_shortest_path__bidirectional(G, source, target, regex_str, timeit=False, queue=BinHeap):
+        """Compute regular language constrained shortest path from source to target in the graph.
+        Runs a forward search on the product of G and the DFA from (source, initial state) and a backward search
+        on the reversed product from all (target, final state) pairs. The search stops once the smallest keys of
+        both heaps add up to at least the length of the best path found so far.
+        Parameters:
+        G : NetworkX graph
+        source : node (Starting node for path)
+        target : node (Ending node for path)
+        regex_str : string (String that specifies regular expression/language)
+        timeit : bool, optional (default = False; If True running time is returned)
+        queue : class, optional (default = BinHeap; priority queue used to select the next product state)
+
+        Returns:
+        dist : int (The length of the shortest path)
+        path : list (A list of nodes in the shortest path)
+        times : dictionary (A dictionary where running times are stored)"""
+
+        if source == target:
+            if not timeit:
+                return 0, [source]
+            else:
+                times = dict()
+                times['regex_to_nfa'] = 0.0
+                times['setup_pointers'] = 0.0
+                times['calculate_path'] = 0.0
+                return 0, [source], times
+
+        t1 = time.clock()
+        (MR, table) = Automaton.compile_regex(regex_str)
+        t2 = time.clock()
+
+        t3 = time.clock()
+        index = GraphHelper.get_label_index(G)
+        outgoing_edgesG = index.successors
+        incoming_edgesG = index.predecessors
+
+        reverse_table = dict()
+        for symbol in table:
+            reverse_table[symbol] = [[] for state in table[symbol]]
+            for state, next_state in enumerate(table[symbol]):
+                if next_state != -1:
+                    reverse_table[symbol][next_state].append(state)
+        t4 = time.clock()
+
+        sourceP = (source, MR.Initial)
+
+        heapF = queue()
+        heapF.insert(sourceP, 0)
+        predF = dict()
+
+        heapB = queue()
+        for state in MR.Final:
+            heapB.insert((target, state), 0)
+        succB = dict()
+
+        dist = float('inf')
+        meeting = None
+
+        while heapF.currentSize > 0 and heapB.currentSize > 0:
+            minF = heapF.key[heapF.findMin()]
+            minB = heapB.key[heapB.findMin()]
+            if minF + minB >= dist:
+                break
+
+            if minF <= minB:
+                min_node = heapF.extractMin()
+                current_weight = heapF.key[min_node]
+                (u, q) = min_node
+
+                for symbol in outgoing_edgesG[u]:
+                    if symbol not in table or table[symbol][q] == -1:
+                        continue
+                    next_state = table[symbol][q]
+                    for v in outgoing_edgesG[u][symbol]:
+                        node = (v, next_state)
+                        edge_weight = G[u][v]['weight']
+                        weight = current_weight + edge_weight
+                        if node not in heapF.key:
+                            heapF.insert(node, weight)
+                            predF[node] = min_node
+                        elif weight < heapF.key[node]:
+                            heapF.decreaseKey(node, weight)
+                            predF[node] = min_node
+                        if node in heapB.key and weight + heapB.key[node] < dist:
+                            dist = weight + heapB.key[node]
+                            meeting = (min_node, node)
+            else:
+                min_node = heapB.extractMin()
+                current_weight = heapB.key[min_node]
+                (v, q) = min_node
+
+                for symbol in incoming_edgesG[v]:
+                    if symbol not in reverse_table:
+                        continue
+                    for previous_state in reverse_table[symbol][q]:
+                        for u in incoming_edgesG[v][symbol]:
+                            node = (u, previous_state)
+                            edge_weight = G[u][v]['weight']
+                            weight = current_weight + edge_weight
+                            if node not in heapB.key:
+                                heapB.insert(node, weight)
+                                succB[node] = min_node
+                            elif weight < heapB.key[node]:
+                                heapB.decreaseKey(node, weight)
+                                succB[node] = min_node
+                            if node in heapF.key and weight + heapF.key[node] < dist:
+                                dist = weight + heapF.key[node]
+                                meeting = (node, min_node)
+
+        path = []
+        if meeting is not None:
+            node = meeting[0]
+            while True:
+                path[:0] = [node[0]]
+                if node == sourceP:
+                    break
+                node = predF[node]
+            node = meeting[1]
+            while True:
+                path.append(node[0])
+                if node not in succB:
+                    break
+                node = succB[node]
+        t5 = time.clock()
+
+        if meeting is not None:
             if not timeit:
                 return dist, path
             else:
@@ -204,6 +517,209 @@ class REGLanguage:
         else:
             raise nx.NetworkXNoPath("No path between %s and %s." % (source, target))
 
+    @staticmethod
+    def st_reg_shortest_path__spg(G, source, target, regex_str):
+        """Compute regular language constrained shortest path from source to target in the SPG G.
+        Every node of the decomposition tree of G gets a min-plus transfer matrix over the states of the DFA, which
+        are combined by min-plus product for series and elementwise minimum for parallel composition. If source and
+        target are not the terminals of G the product of the DAG G and the DFA is searched instead.
+        The matrices are cached per regular expression in GraphHelper.transfer_matrices and reused by later queries
+        on the same tree. Label changes through GraphHelper drop them; after changing weights or writing labels
+        directly, GraphHelper.invalidate_label_index(G) has to be called.
+        Parameters:
+        G : NetworkX graph
+        source : node (Starting node for path)
+        target : node (Ending node for path)
+        regex_str : string (String that specifies regular expression/language)
+
+        Returns:
+        dist : int (The length of the shortest path)
+        path : list (A list of nodes in the shortest path)"""
+
+        tree = GraphHelper.get_sp_tree(G)
+        if source != tree.source or target != tree.sink:
+            return REGLanguage.st_reg_shortest_path__dag(G, source, target, regex_str)
+
+        (MR, table) = Automaton.compile_regex(regex_str)
+        entry = GraphHelper.transfer_matrices.get(G)
+        if entry is None or entry[0] is not tree:
+            entry = (tree, RegexCache(maxsize=16))
+            GraphHelper.transfer_matrices[G] = entry
+        M = entry[1].get(regex_str)
+        if M is None:
+            M = REGLanguage.get_transfer_matrices(G, tree, table, len(MR.States))
+            entry[1].put(regex_str, M)
+
+        row = M[tree.root][MR.Initial]
+        finals = [state for state in MR.Final if row[state] < float('inf')]
+        if not finals:
+            raise nx.NetworkXNoPath("No path between %s and %s." % (source, target))
+        final = min(finals, key=lambda state: row[state])
+
+        path = REGLanguage.get_spg_path(tree, M, MR.Initial, final)
+        return row[final], path
+
+    @staticmethod
+    def st_reg_shortest_path__dag(G, source, target, regex_str):
+        """Compute regular language constrained shortest path from source to target in the DAG G.
+        The product of G and the DFA is relaxed once in topological order of G.
+        Parameters:
+        G : NetworkX graph
+        source : node (Starting node for path)
+        target : node (Ending node for path)
+        regex_str : string (String that specifies regular expression/language)
+
+        Returns:
+        dist : int (The length of the shortest path)
+        path : list (A list of nodes in the shortest path)"""
+
+        (MR, table) = Automaton.compile_regex(regex_str)
+
+        dist = {source: {MR.Initial: 0}}
+        pred = dict()
+        for node in DAGraph.top_sort(G):
+            if node not in dist:
+                continue
+            for u, v, data in G.out_edges(node, data=True):
+                successors = table.get(data.get('label'))
+                if successors is None:
+                    continue
+                for state, weight in dist[node].items():
+                    successor = successors[state]
+                    if successor == -1:
+                        continue
+                    weight += data['weight']
+                    if v not in dist:
+                        dist[v] = dict()
+                    if successor not in dist[v] or weight < dist[v][successor]:
+                        dist[v][successor] = weight
+                        pred[(v, successor)] = (node, state)
+
+        finals = [state for state in MR.Final if state in dist.get(target, ())]
+        if not finals:
+            raise nx.NetworkXNoPath("No path between %s and %s." % (source, target))
+        final = min(finals, key=lambda state: dist[target][state])
+
+        path = [target]
+        node = (target, final)
+        while node != (source, MR.Initial):
+            node = pred[node]
+            path.append(node[0])
+        path.reverse()
+        return dist[target][final], path
+
+    @staticmethod
+    def get_transfer_matrices(G, tree, table, size):
+        """Computes min-plus transfer matrices bottom-up on the decomposition tree of the SPG G.
+        The matrices depend on the transitions of the DFA, so they can only be reused for the same DFA.
+        Parameters:
+        G : NetworkX graph
+        tree : SPTree (decomposition tree of G)
+        table : dictionary (table[symbol][state] is the successor state or -1 if there is none)
+        size : int (number of states of the DFA)
+
+        Returns:
+        M : dictionary (M[t][p][q] is the length of a shortest path through tree node t from its first to its second
+        terminal that leads the DFA from state p to state q)"""
+
+        inf = float('inf')
+        multigraph = G.is_multigraph()
+
+        M = dict()
+        for current in tree.order:
+            kind = tree.kind[current]
+            children = tree.children[current]
+            if kind == 'edge':
+                (u, v, key) = tree.edge[current]
+                if multigraph:
+                    data = G[u][v][key]
+                else:
+                    data = G[u][v]
+                matrix = [[inf] * size for state in range(size)]
+                successors = table.get(data.get('label'))
+                if successors is not None:
+                    for state in range(size):
+                        if successors[state] != -1:
+                            matrix[state][successors[state]] = data['weight']
+            elif kind == 'series':
+                matrix = M[children[0]]
+                for child in children[1:]:
+                    matrix = REGLanguage.transfer_product(matrix, M[child])
+            else:
+                matrix = [list(row) for row in M[children[0]]]
+                for child in children[1:]:
+                    for row, other in zip(matrix, M[child]):
+                        for state in range(size):
+                            if other[state] < row[state]:
+                                row[state] = other[state]
+            M[current] = matrix
+        return M
+
+    @staticmethod
+    def transfer_product(X, Y):
+        """Computes min-plus product of transfer matrices.
+        Parameters:
+        X : list of lists (size r x n)
+        Y : list of lists (size n x n)
+
+        Returns:
+        Z : list of lists (Z[i][j] = min over k of X[i][k] + Y[k][j])"""
+
+        inf = float('inf')
+        size = len(Y)
+        Z = []
+        for row in X:
+            product = [inf] * size
+            for k in range(size):
+                if row[k] == inf:
+                    continue
+                for j, weight in enumerate(Y[k]):
+                    weight += row[k]
+                    if weight < product[j]:
+                        product[j] = weight
+            Z.append(product)
+        return Z
+
+    @staticmethod
+    def get_spg_path(tree, M, initial, final):
+        """Computes shortest path through the decomposition tree that leads the DFA from initial to final state.
+        Parameters:
+        tree : SPTree (decomposition tree of the SPG)
+        M : dictionary (transfer matrices of the tree nodes)
+        initial : int (state at the source of the SPG)
+        final : int (state at the sink of the SPG)
+
+        Returns:
+        path : list (A list of nodes in the shortest path)"""
+
+        path = [tree.source]
+        stack = [(tree.root, initial, final)]
+        while stack:
+            (current, p, q) = stack.pop()
+            kind = tree.kind[current]
+            children = tree.children[current]
+            if kind == 'edge':
+                path.append(tree.ends[current][1])
+            elif kind == 'parallel':
+                for child in children:
+                    if M[child][p][q] == M[current][p][q]:
+                        stack.append((child, p, q))
+                        break
+            else:
+                rows = [M[children[0]][p]]
+                for child in children[1:-1]:
+                    rows.append(REGLanguage.transfer_product([rows[-1]], M[child])[0])
+                weight = M[current][p][q]
+                for i in range(len(children) - 1, 0, -1):
+                    child = M[children[i]]
+                    for state, prefix in enumerate(rows[i - 1]):
+                        if prefix + child[state][q] == weight:
+                            break
+                    stack.append((children[i], state, q))
+                    (weight, q) = (prefix, state)
+                stack.append((children[0], p, q))
+        return path
+
 
 class CFLanguage:
 
@@ -231,21 +747,16 @@ class CFLanguage:
                 for A in nonterminals:
                     D[u][v][A] = float('inf')
 
-        start = grammar.Start
-        epsilon = common.Epsilon
-        if (start, [epsilon]) in grammar.Rules or (start, epsilon) in grammar.Rules:
-            for v in nodes:
-                D[v][v][start] = 0
+        compiled = GrammarHelper.get_compiled_grammar(grammar)
+        names = compiled.nonterminals
 
-        derivatives = dict()
-        for A in nonterminals:
-            derivatives[A] = GrammarHelper.get_derivatives_of(grammar, A)
+        for A in compiled.epsilon_heads:
+            for v in nodes:
+                D[v][v][names[A]] = 0
 
         for u, v, data in G.edges(data=True):
-            a = data['label']
-            for A in nonterminals:
-                if a in derivatives[A]:
-                    D[u][v][A] = data['weight']
+            for A in compiled.terminal_heads.get(data['label'], ()):
+                D[u][v][names[A]] = data['weight']
 
         return D
 
@@ -295,6 +806,397 @@ class CFLanguage:
 
         return D
 
+    @staticmethod
+    def all_pair_cfg_shortest_path__worklist(G, grammar, paths=False, dense=True):
+        """Compute context-free language constrained all-pair shortest paths in the graph.
+        Facts (u, A, v) are settled in order of their distance (Knuth's generalization of Dijkstra's algorithm).
+        A settled fact is only combined with settled facts that start at v or end at u.
+        Parameters:
+        G : NetworkX graph
+        grammar: FAdo CNF (grammar in Chomskey Normal From)
+        paths : bool, optional (default = False; If True back-pointers for get_path are returned)
+        dense : bool, optional (default = True; If False a CFLTable with the finite distances is returned)
+
+        Returns:
+        D : dictionary or CFLTable (Table with all-pair shortest-path distances)
+        pred : dictionary (back-pointers of the derived facts for CFLanguage.get_path)"""
+
+        grammar.makenonterminals()
+        nonterminals = grammar.Nonterminals
+
+        compiled = GrammarHelper.get_compiled_grammar(grammar)
+        names = compiled.nonterminals
+        left_rules = compiled.left_rules
+        right_rules = compiled.right_rules
+
+        dist = dict()
+        pred = dict()
+        heap = []
+        counter = itertools.count()
+
+        for A in compiled.epsilon_heads:
+            for v in G.nodes():
+                dist[(v, A, v)] = 0
+                if paths:
+                    pred[(v, A, v)] = (None, -2)
+                heapq.heappush(heap, (0, next(counter), (v, A, v)))
+
+        for u, v, data in G.edges(data=True):
+            for A in compiled.terminal_heads.get(data['label'], ()):
+                fact = (u, A, v)
+                if data['weight'] < dist.get(fact, float('inf')):
+                    dist[fact] = data['weight']
+                    if paths:
+                        pred[fact] = (None, -1)
+                    heapq.heappush(heap, (data['weight'], next(counter), fact))
+
+        table = CFLTable()
+        while heap:
+            (current_weight, count, fact) = heapq.heappop(heap)
+            (u, B, v) = fact
+            if table.contains(u, names[B], v):
+                continue
+            table.add(u, names[B], v, current_weight)
+            del dist[fact]
+
+            new_facts = []
+            for A, C, i in left_rules[B]:
+                for w, weight in table.successors(v, names[C]).items():
+                    new_facts.append(((u, A, w), current_weight + weight, v, i))
+            for A, C, i in right_rules[B]:
+                for w, weight in table.predecessors(names[C], u).items():
+                    new_facts.append(((w, A, v), weight + current_weight, u, i))
+
+            for new_fact, weight, split, i in new_facts:
+                (x, A, y) = new_fact
+                if not table.contains(x, names[A], y) and weight < dist.get(new_fact, float('inf')):
+                    dist[new_fact] = weight
+                    if paths:
+                        pred[new_fact] = (split, i)
+                    heapq.heappush(heap, (weight, next(counter), new_fact))
+
+        if dense:
+            D = table.to_dict(G.nodes(), nonterminals)
+        else:
+            D = table
+
+        if paths:
+            return D, pred
+        return D
+
+    @staticmethod
+    def st_cfg_shortest_path(G, source, target, grammar):
+        """Compute context-free language constrained shortest path from source to target in the graph.
+        Only facts (u, A, v) where A is predicted at u by a derivation starting with (source, S) are derived
+        and the search stops as soon as (source, S, target) is settled.
+        Parameters:
+        G : NetworkX graph
+        source : node (Starting node for path)
+        target : node (Ending node for path)
+        grammar: FAdo CNF (grammar in Chomskey Normal From)
+
+        Returns:
+        dist : int (The length of the shortest path)
+        path : list (A list of nodes in the shortest path)"""
+
+        compiled = GrammarHelper.get_compiled_grammar(grammar)
+        start = compiled.start
+        left_rules = compiled.left_rules
+        right_rules = compiled.right_rules
+        head_rules = compiled.head_rules
+        terminal_heads = dict()
+        for a in compiled.terminal_heads:
+            terminal_heads[a] = set(compiled.terminal_heads[a])
+        epsilon_heads = set(compiled.epsilon_heads)
+
+        edges = GraphHelper.get_label_index(G).successors
+        multigraph = G.is_multigraph()
+
+        dist = dict()
+        pred = dict()
+        heap = []
+        counter = itertools.count()
+
+        def relax(fact, weight, back):
+            if not settled.contains(*fact) and weight < dist.get(fact, float('inf')):
+                dist[fact] = weight
+                pred[fact] = back
+                heapq.heappush(heap, (weight, next(counter), fact))
+
+        predicted = set()
+        settled = CFLTable()
+
+        def predict(u, A):
+            stack = [(u, A)]
+            while stack:
+                (u, A) = stack.pop()
+                if (u, A) in predicted:
+                    continue
+                predicted.add((u, A))
+
+                if A in epsilon_heads:
+                    relax((u, A, u), 0, (None, -2))
+                for a in edges[u]:
+                    if A in terminal_heads.get(a, ()):
+                        for v in edges[u][a]:
+                            if multigraph:
+                                weight = min([data['weight'] for data in G[u][v].values() if data['label'] == a])
+                            else:
+                                weight = G[u][v]['weight']
+                            relax((u, A, v), weight, (None, -1))
+
+                for B, C, i in head_rules[A]:
+                    stack.append((u, B))
+                    for w, weight in settled.successors(u, B).items():
+                        stack.append((w, C))
+                        for v, weight2 in settled.successors(w, C).items():
+                            relax((u, A, v), weight + weight2, (w, i))
+
+        predict(source, start)
+
+        path_found = 0
+        path = []
+        distance = float('inf')
+
+        while heap:
+            (current_weight, count, fact) = heapq.heappop(heap)
+            (u, B, w) = fact
+            if settled.contains(u, B, w):
+                continue
+            settled.add(u, B, w, current_weight)
+
+            if fact == (source, start, target):
+                path_found = 1
+                distance = current_weight
+                path = CFLanguage.get_path(pred, fact, compiled)
+                break
+
+            for A, C, i in left_rules[B]:
+                if (u, A) in predicted:
+                    predict(w, C)
+                    for v, weight in settled.successors(w, C).items():
+                        relax((u, A, v), current_weight + weight, (w, i))
+            for A, C, i in right_rules[B]:
+                for x, weight in settled.predecessors(C, u).items():
+                    if (x, A) in predicted:
+                        relax((x, A, w), weight + current_weight, (u, i))
+
+        if path_found:
+            return distance, path
+        else:
+            raise nx.NetworkXNoPath("No path between %s and %s." % (source, target))
+
+    @staticmethod
+    def get_path(pred, fact, compiled):
+        """Reconstructs path of a derived fact from its back-pointers without recursion.
+        Nonterminals in facts are the integer ids of the compiled grammar (see GrammarHelper.get_compiled_grammar).
+        Parameters:
+        pred : dictionary (pred[(u, A, v)] is (split node, rule index); rule index -1 for an edge, -2 for epsilon)
+        fact : tuple (fact (u, A, v) to reconstruct)
+        compiled : CompiledGrammar (compiled grammar the back-pointers were computed with)
+
+        Returns:
+        path : list (A list of nodes in the path)"""
+
+        path = [fact[0]]
+        stack = [fact]
+        while stack:
+            (u, A, v) = stack.pop()
+            (w, i) = pred[(u, A, v)]
+            if i == -1:
+                path.append(v)
+            elif i == -2:
+                pass
+            else:
+                (B, C) = compiled.rules[i][1]
+                stack.append((w, C, v))
+                stack.append((u, B, w))
+        return path
+
+    @staticmethod
+    def all_pair_cfg_shortest_path__matrix(G, grammar):
+        """Compute context-free language constrained all-pair shortest paths in the graph.
+        Distances are kept in one dense NumPy array per nonterminal and the closure is computed with
+        vectorized min-plus products for each rule A -> B C until no distance changes.
+        Parameters:
+        G : NetworkX graph
+        grammar: FAdo CNF (grammar in Chomskey Normal From)
+
+        Returns:
+        nodes : list (nodes of the graph, position in list is row/column index of the arrays)
+        M : dictionary (M[A][i, j] is the shortest-path distance from nodes[i] to nodes[j] for nonterminal A)"""
+
+        grammar.makenonterminals()
+        nonterminals = grammar.Nonterminals
+        compiled = GrammarHelper.get_compiled_grammar(grammar)
+        names = compiled.nonterminals
+
+        nodes = G.nodes()
+        n = len(nodes)
+
+        M = dict()
+        for A in nonterminals:
+            M[A] = np.full((n, n), np.inf)
+        CFLanguage.initialize_arrays(G, grammar, nodes, M)
+
+        changed = True
+        while changed:
+            changed = False
+            for (B, C), heads in compiled.binary_heads.items():
+                product = CFLanguage.min_plus_product(M[names[B]], M[names[C]])
+                for A in heads:
+                    if (product < M[names[A]]).any():
+                        np.minimum(M[names[A]], product, out=M[names[A]])
+                        changed = True
+
+        return nodes, M
+
+    @staticmethod
+    def initialize_arrays(G, grammar, nodes, M):
+        """Writes initial distance values of edges and epsilon rules into the arrays of the matrix engines.
+        Parameters:
+        G : NetworkX graph
+        grammar: FAdo CNF (grammar in Chomskey Normal From)
+        nodes : list (nodes of the graph, position in list is row/column index of the arrays)
+        M : dictionary (M[A] is an array of size n x n filled with inf for every nonterminal A)"""
+
+        compiled = GrammarHelper.get_compiled_grammar(grammar)
+        names = compiled.nonterminals
+
+        index = dict()
+        for i, node in enumerate(nodes):
+            index[node] = i
+
+        for A in compiled.epsilon_heads:
+            np.fill_diagonal(M[names[A]], 0)
+
+        for u, v, data in G.edges(data=True):
+            for A in compiled.terminal_heads.get(data['label'], ()):
+                i = index[u]
+                j = index[v]
+                M[names[A]][i, j] = min(M[names[A]][i, j], data['weight'])
+
+    @staticmethod
+    def all_pair_cfg_shortest_path__parallel(G, grammar, processes=None, blocks=None):
+        """Compute context-free language constrained all-pair shortest paths in the graph with a process pool.
+        The arrays of the matrix engine are kept in shared memory and the node set is split into row blocks.
+        In each round every worker applies all rules A -> B C to the rows of its block, until no row changes.
+        Workers update their rows in place; since distances only decrease, reading rows of other blocks that are
+        updated at the same time still gives valid distances and the same fixpoint is reached.
+        Parameters:
+        G : NetworkX graph
+        grammar: FAdo CNF (grammar in Chomskey Normal From)
+        processes : int, optional (default = None; number of worker processes, None for the number of cores)
+        blocks : int, optional (default = None; number of row blocks, None for 4 blocks per process)
+
+        Returns:
+        nodes : list (nodes of the graph, position in list is row/column index of the arrays)
+        M : dictionary (M[A][i, j] is the shortest-path distance from nodes[i] to nodes[j] for nonterminal A)"""
+
+        grammar.makenonterminals()
+        nonterminals = sorted(grammar.Nonterminals)
+        compiled = GrammarHelper.get_compiled_grammar(grammar)
+        names = compiled.nonterminals
+
+        nodes = G.nodes()
+        n = len(nodes)
+        m = len(nonterminals)
+
+        if processes is None:
+            processes = multiprocessing.cpu_count()
+        if blocks is None:
+            blocks = 4 * processes
+        blocks = max(1, min(blocks, n))
+
+        buffer = multiprocessing.RawArray('d', m * n * n)
+        arrays = np.frombuffer(buffer, dtype=np.float64).reshape((m, n, n))
+        arrays.fill(np.inf)
+        M = dict()
+        for i, A in enumerate(nonterminals):
+            M[A] = arrays[i]
+        CFLanguage.initialize_arrays(G, grammar, nodes, M)
+
+        position = dict()
+        for i, A in enumerate(nonterminals):
+            position[A] = i
+        rules = []
+        for (B, C), heads in compiled.binary_heads.items():
+            rules.append((position[names[B]], position[names[C]], [position[names[A]] for A in heads]))
+
+        bounds = [(n * i // blocks, n * (i + 1) // blocks) for i in range(blocks)]
+        bounds = [(r0, r1) for (r0, r1) in bounds if r0 < r1]
+
+        if processes == 1:
+            _init_cfl_worker(buffer, (m, n, n), rules)
+            try:
+                while any([_cfl_closure_rows(bound) for bound in bounds]):
+                    pass
+            finally:
+                _cfl_worker.clear()
+        else:
+            pool = multiprocessing.Pool(processes, _init_cfl_worker, (buffer, (m, n, n), rules))
+            try:
+                while any(pool.map(_cfl_closure_rows, bounds)):
+                    pass
+            finally:
+                pool.close()
+                pool.join()
+
+        return nodes, M
+
+    @staticmethod
+    def min_plus_product(X, Y):
+        """Computes min-plus product of a block of rows and a square array.
+        Parameters:
+        X : NumPy array (size r x n)
+        Y : NumPy array (size n x n)
+
+        Returns:
+        Z : NumPy array (Z[i, j] = min over k of X[i, k] + Y[k, j])"""
+
+        Z = np.full(X.shape, np.inf)
+        ks = np.nonzero(np.isfinite(X).any(axis=0) & np.isfinite(Y).any(axis=1))[0]
+        for k in ks:
+            np.minimum(Z, X[:, k, None] + Y[None, k, :], out=Z)
+        return Z
+
+
+_cfl_worker = dict()
+
+
+def _init_cfl_worker(buffer, shape, rules):
+    """Stores shared arrays and rules of the parallel CFL engine in a worker process.
+    Module-level, so the pool can pickle it by name.
+    Parameters:
+    buffer : multiprocessing RawArray (distances of all nonterminals)
+    shape : tuple (number of nonterminals, number of nodes, number of nodes)
+    rules : list (tuples (B, C, heads) with array positions of the nonterminals)"""
+
+    _cfl_worker['arrays'] = np.frombuffer(buffer, dtype=np.float64).reshape(shape)
+    _cfl_worker['rules'] = rules
+
+
+def _cfl_closure_rows(bound):
+    """Applies all rules to one row block of the shared arrays of the parallel CFL engine.
+    Parameters:
+    bound : tuple (first row, last row + 1)
+
+    Returns:
+    changed : bool (whether a distance in the block decreased)"""
+
+    (r0, r1) = bound
+    arrays = _cfl_worker['arrays']
+
+    changed = False
+    for B, C, heads in _cfl_worker['rules']:
+        product = CFLanguage.min_plus_product(arrays[B, r0:r1], arrays[C])
+        for A in heads:
+            rows = arrays[A, r0:r1]
+            if (product < rows).any():
+                np.minimum(rows, product, out=rows)
+                changed = True
+    return changed
+
 
 class KSimilarPath:
 
@@ -329,6 +1231,7 @@ class KSimilarPath:
                 G[u][v]['label'] = 't'
             else:
                 G[u][v]['label'] = 'f'
+        GraphHelper.invalidate_label_index(G)
 
         regex_helper = 'f*'
         regex_str = 'f*'
@@ -352,3 +1255,289 @@ class KSimilarPath:
             return dist, distk, path, pathk, times
         else:
             return dist, distk, path, pathk
+
+    @staticmethod
+    def st_k_similar_path__layered(G, source, target, k, timeit=False, queue=BinHeap):
+        """Compute k-similar path from source to target in the graph.
+        Dijkstra runs on states (node, j) where j is the number of shortest-path edges used so far (j <= k),
+        so G is not relabeled and no automaton is built.
+        Parameters:
+        G : NetworkX graph
+        source : node (Starting node for paths)
+        target : node (Ending node for paths)
+        k : int (number of common edges allowed)
+        timeit : bool, optional (default = False; If True running time is returned)
+        queue : class, optional (default = BinHeap; priority queue used to select the next state)
+
+        Returns:
+        dist : int (The length of the shortest path)
+        distk : int (The length of the k-similar path)
+        path : list (A list of nodes in the shortest path)
+        pathk : list (A list of nodes in the k-similar path)
+        times : dictionary (A dictionary where running times are stored)"""
+
+        try:
+            t1 = time.clock()
+            (dist, path) = Dijkstra.st_shortest_path_heap(G, source, target, queue)
+            t2 = time.clock()
+            time_sp = t2-t1
+        except nx.NetworkXNoPath:
+            raise nx.NetworkXNoPath("No path between %s and %s." % (source, target))
+
+        t3 = time.clock()
+        shared = set(GraphHelper.get_edgelist_from_nodelist(path))
+        t4 = time.clock()
+
+        t5 = time.clock()
+        (distances, pred) = KSimilarPath.layered_search(G, source, target, shared, k, queue)
+        t6 = time.clock()
+
+        if not distances:
+            raise nx.NetworkXNoPath("No k similar path between %s and %s." % (source, target))
+        j = min(distances, key=lambda j: distances[j])
+        distk = distances[j]
+        pathk = KSimilarPath.get_path(pred, source, (target, j))
+
+        if timeit:
+            times = dict()
+            times['ShP'] = time_sp
+            times['Labels'] = t4 - t3
+            times['KSimP'] = t6 - t5
+            return dist, distk, path, pathk, times
+        else:
+            return dist, distk, path, pathk
+
+    @staticmethod
+    def st_k_similar_path__sweep(G, source, target, k_max, paths=False, timeit=False, queue=BinHeap):
+        """Compute k-similar paths from source to target for all k <= k_max with one layered search.
+        Parameters:
+        G : NetworkX graph
+        source : node (Starting node for paths)
+        target : node (Ending node for paths)
+        k_max : int (maximum number of common edges allowed)
+        paths : bool, optional (default = False; If True the k-similar paths are returned)
+        timeit : bool, optional (default = False; If True running time is returned)
+        queue : class, optional (default = BinHeap; priority queue used to select the next state)
+
+        Returns:
+        dist : int (The length of the shortest path)
+        path : list (A list of nodes in the shortest path)
+        distsk : list (distsk[k] is the length of the k-similar path, inf if there is none)
+        pathsk : list (pathsk[k] is a list of nodes in the k-similar path, None if there is none)
+        times : dictionary (A dictionary where running times are stored)"""
+
+        try:
+            t1 = time.clock()
+            (dist, path) = Dijkstra.st_shortest_path_heap(G, source, target, queue)
+            t2 = time.clock()
+            time_sp = t2-t1
+        except nx.NetworkXNoPath:
+            raise nx.NetworkXNoPath("No path between %s and %s." % (source, target))
+
+        t3 = time.clock()
+        shared = set(GraphHelper.get_edgelist_from_nodelist(path))
+        t4 = time.clock()
+
+        t5 = time.clock()
+        (distances, pred) = KSimilarPath.layered_search(G, source, target, shared, k_max, queue, first=False)
+
+        distsk = []
+        layers = []
+        best = None
+        for k in range(k_max + 1):
+            if k in distances and (best is None or distances[k] < distances[best]):
+                best = k
+            if best is None:
+                distsk.append(float('inf'))
+            else:
+                distsk.append(distances[best])
+            layers.append(best)
+        t6 = time.clock()
+
+        result = [dist, path, distsk]
+        if paths:
+            pathsk = []
+            for best in layers:
+                if best is None:
+                    pathsk.append(None)
+                else:
+                    pathsk.append(KSimilarPath.get_path(pred, source, (target, best)))
+            result.append(pathsk)
+        if timeit:
+            times = dict()
+            times['ShP'] = time_sp
+            times['Labels'] = t4 - t3
+            times['KSimP'] = t6 - t5
+            result.append(times)
+        return tuple(result)
+
+    @staticmethod
+    def layered_search(G, source, target, shared, k, queue=BinHeap, first=True):
+        """Runs Dijkstra on states (node, j) where j is the number of edges in shared used so far (j <= k).
+        Parameters:
+        G : NetworkX graph
+        source : node (Starting node for paths)
+        target : node (Ending node for paths)
+        shared : set (edges (u, v) that are counted)
+        k : int (maximum number of counted edges)
+        queue : class, optional (default = BinHeap; priority queue used to select the next state)
+        first : bool, optional (default = True; If True the search stops at the first settled target state)
+
+        Returns:
+        distances : dictionary (distances[j] is the distance of the settled state (target, j))
+        pred : dictionary (predecessor state of every reached state)"""
+
+        multigraph = G.is_multigraph()
+
+        heap = queue()
+        heap.insert((source, 0), 0)
+        pred = dict()
+        distances = dict()
+
+        while heap.currentSize > 0:
+            min_node = heap.extractMin()
+            (u, j) = min_node
+            current_weight = heap.key[min_node]
+
+            if u == target:
+                distances[j] = current_weight
+                if first or len(distances) == k + 1:
+                    break
+
+            for v in G.successors(u):
+                if multigraph:
+                    weight = current_weight + min([data['weight'] for data in G[u][v].values()])
+                else:
+                    weight = current_weight + G[u][v]['weight']
+                if (u, v) in shared:
+                    if j == k:
+                        continue
+                    node = (v, j + 1)
+                else:
+                    node = (v, j)
+                if node not in heap.key:
+                    heap.insert(node, weight)
+                    pred[node] = min_node
+                elif weight < heap.key[node]:
+                    heap.decreaseKey(node, weight)
+                    pred[node] = min_node
+
+        return distances, pred
+
+    @staticmethod
+    def get_path(pred, source, state):
+        """Reconstructs node path of a state of the layered search.
+        Parameters:
+        pred : dictionary (predecessor state of every reached state)
+        source : node (Starting node for paths)
+        state : tuple (state (node, j) at the end of the path)
+
+        Returns:
+        path : list (A list of nodes in the path)"""
+
+        path = []
+        while True:
+            path[:0] = [state[0]]
+            if state == (source, 0):
+                break
+            state = pred[state]
+        return path
+
+
+class CFLTable:
+
+    def __init__(self):
+        """Initialize a sparse table of cfl-constrained distances.
+        Only finite facts (u, A, v) are stored, indexed by (u, A) and by (A, v)."""
+
+        self.outgoing = dict()
+        self.incoming = dict()
+        self.size = 0
+
+    def add(self, u, A, v, dist):
+        """Stores distance of fact (u, A, v).
+        Parameters:
+        u, v : node
+        A : nonterminal
+        dist : int (distance of the fact)"""
+
+        successors = self.outgoing.setdefault((u, A), dict())
+        if v not in successors:
+            self.size = self.size + 1
+        successors[v] = dist
+        self.incoming.setdefault((A, v), dict())[u] = dist
+
+    def contains(self, u, A, v):
+        """Tests if fact (u, A, v) is stored.
+        Parameters:
+        u, v : node
+        A : nonterminal
+
+        Returns:
+        bool (whether the fact is stored)"""
+
+        successors = self.outgoing.get((u, A))
+        return successors is not None and v in successors
+
+    def get(self, u, A, v):
+        """Computes distance of fact (u, A, v).
+        Parameters:
+        u, v : node
+        A : nonterminal
+
+        Returns:
+        dist : int (distance of the fact, inf if it is not stored)"""
+
+        return self.outgoing.get((u, A), dict()).get(v, float('inf'))
+
+    def successors(self, u, A):
+        """Computes facts starting at u with nonterminal A.
+        Parameters:
+        u : node
+        A : nonterminal
+
+        Returns:
+        successors : dictionary (successors[v] is the distance of (u, A, v))"""
+
+        return self.outgoing.get((u, A), dict())
+
+    def predecessors(self, A, v):
+        """Computes facts ending at v with nonterminal A.
+        Parameters:
+        A : nonterminal
+        v : node
+
+        Returns:
+        predecessors : dictionary (predecessors[u] is the distance of (u, A, v))"""
+
+        return self.incoming.get((A, v), dict())
+
+    def facts(self):
+        """Iterates over stored facts.
+
+        Returns:
+        generator of tuples (u, A, v, dist)"""
+
+        for (u, A), successors in self.outgoing.items():
+            for v, dist in successors.items():
+                yield u, A, v, dist
+
+    def to_dict(self, nodes, nonterminals):
+        """Converts table to the dense format of CFLanguage.initialize_matrix.
+        Parameters:
+        nodes : list
+        nonterminals : set
+
+        Returns:
+        D : dictionary (D[u][v][A] is the distance of (u, A, v))"""
+
+        D = dict()
+        for u in nodes:
+            D[u] = dict()
+            for v in nodes:
+                D[u][v] = dict()
+                for A in nonterminals:
+                    D[u][v][A] = float('inf')
+        for u, A, v, dist in self.facts():
+            D[u][v][A] = dist
+        return D
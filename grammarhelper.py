@@ -1,3 +1,7 @@
+from FAdo.cfg import *
+from array import array
+
+
 class GrammarHelper:
 
     @staticmethod
@@ -10,6 +14,20 @@ class GrammarHelper:
         Returns:
         bool (whether word is derivable)"""
 
+        if isinstance(grammar, CNF):
+            return GrammarHelper.is_derivable_cyk(grammar, word)
+        return GrammarHelper.is_derivable_earley(grammar, word)
+
+    @staticmethod
+    def is_derivable__expand(grammar, word):
+        """Tests if word is accepted by grammar by expanding all sentential forms up to the length of word.
+        Parameters:
+        grammar: FAdo CNF (grammar in Chomskey Normal From)
+        word : list (list of terminal symbols)
+
+        Returns:
+        bool (whether word is derivable)"""
+
         length = len(word)
 
         start = grammar.Start
@@ -58,4 +76,322 @@ class GrammarHelper:
             derivative = rules[j][1]
             derivatives.add(derivative)
 
-        return derivatives
\ No newline at end of file
+        return derivatives
+
+    @staticmethod
+    def get_reverse_rules(grammar):
+        """Computes reverse rule index of grammar.
+        Parameters:
+        grammar: FAdo CFGrammar
+
+        Returns:
+        reverse : dictionary (reverse[body] is the set of heads of rules with that body)"""
+
+        reverse = dict()
+        for head, body in grammar.Rules:
+            if isinstance(body, list):
+                body = tuple(body)
+            reverse.setdefault(body, set()).add(head)
+
+        return reverse
+
+    @staticmethod
+    def get_compiled_grammar(grammar):
+        """Returns compiled rule tables of grammar, building them if there are none or they are out of date.
+        The tables are stored in grammar.compiled_grammar and reused by later queries.
+        Parameters:
+        grammar: FAdo CNF (grammar in Chomskey Normal From)
+
+        Returns:
+        compiled : CompiledGrammar"""
+
+        compiled = getattr(grammar, 'compiled_grammar', None)
+        if compiled is None or not compiled.is_current(grammar):
+            compiled = CompiledGrammar(grammar)
+            grammar.compiled_grammar = compiled
+        return compiled
+
+    @staticmethod
+    def get_rule_index(grammar):
+        """Returns reverse-rule index of grammar used by the membership tests, building it if there is none or it is
+        out of date. The index is stored in grammar.rule_index and reused by later tests, like the compiled grammar.
+        Parameters:
+        grammar: FAdo CFGrammar
+
+        Returns:
+        index : RuleIndex"""
+
+        index = getattr(grammar, 'rule_index', None)
+        if index is None or not index.is_current(grammar):
+            index = RuleIndex(grammar)
+            grammar.rule_index = index
+        return index
+
+    @staticmethod
+    def get_nullable(grammar):
+        """Computes nonterminals that derive the empty word.
+        Parameters:
+        grammar: FAdo CFGrammar
+
+        Returns:
+        nullable : set"""
+
+        epsilon = common.Epsilon
+
+        nullable = set()
+        changed = True
+        while changed:
+            changed = False
+            for head, body in grammar.Rules:
+                if head in nullable:
+                    continue
+                if isinstance(body, (tuple, list)):
+                    symbols = body
+                else:
+                    symbols = [body]
+                if all([symbol == epsilon or symbol in nullable for symbol in symbols]):
+                    nullable.add(head)
+                    changed = True
+
+        return nullable
+
+    @staticmethod
+    def is_derivable_cyk(grammar, word):
+        """Tests if word is accepted by grammar with the CYK algorithm.
+        Rules A -> B C where B or C is nullable are treated as unit rules.
+        Parameters:
+        grammar: FAdo CNF (grammar in Chomskey Normal From)
+        word : list (list of terminal symbols)
+
+        Returns:
+        bool (whether word is derivable)"""
+
+        if isinstance(word, str):
+            word = [word]
+        n = len(word)
+
+        start = grammar.Start
+        index = GrammarHelper.get_rule_index(grammar)
+        reverse = index.reverse
+        binary = index.binary
+        unit = index.unit
+
+        if n == 0:
+            return start in index.nullable
+
+        def closure(cell):
+            stack = list(cell)
+            while stack:
+                B = stack.pop()
+                for A in unit.get(B, ()):
+                    if A not in cell:
+                        cell.add(A)
+                        stack.append(A)
+            return cell
+
+        T = dict()
+        for i in range(n):
+            T[(i, 1)] = closure(set(reverse.get(word[i], ())))
+
+        for l in range(2, n + 1):
+            for i in range(n - l + 1):
+                cell = set()
+                for k in range(1, l):
+                    right = T[(i + k, l - k)]
+                    for B in T[(i, k)]:
+                        for C, heads in binary.get(B, dict()).items():
+                            if C in right:
+                                cell.update(heads)
+                T[(i, l)] = closure(cell)
+
+        return start in T[(0, n)]
+
+    @staticmethod
+    def is_derivable_earley(grammar, word):
+        """Tests if word is accepted by grammar with Earley's algorithm.
+        Nullable nonterminals are skipped during prediction (Aycock and Horspool).
+        Parameters:
+        grammar: FAdo CFGrammar
+        word : list (list of terminal symbols)
+
+        Returns:
+        bool (whether word is derivable)"""
+
+        if isinstance(word, str):
+            word = [word]
+        n = len(word)
+
+        start = grammar.Start
+        index = GrammarHelper.get_rule_index(grammar)
+        nullable = index.nullable
+        bodies = index.bodies
+
+        chart = [set() for i in range(n + 1)]
+        waiting = [dict() for i in range(n + 1)]
+        for body in bodies.get(start, ()):
+            chart[0].add((start, body, 0, 0))
+
+        for i in range(n + 1):
+            agenda = list(chart[i])
+
+            def add(item):
+                if item not in chart[i]:
+                    chart[i].add(item)
+                    agenda.append(item)
+
+            while agenda:
+                (head, body, dot, origin) = agenda.pop()
+                if dot < len(body):
+                    X = body[dot]
+                    if X in bodies:
+                        waiting[i].setdefault(X, []).append((head, body, dot, origin))
+                        for body2 in bodies[X]:
+                            add((X, body2, 0, i))
+                        if X in nullable:
+                            add((head, body, dot + 1, origin))
+                    elif i < n and X == word[i]:
+                        chart[i + 1].add((head, body, dot + 1, origin))
+                else:
+                    for (head2, body2, dot2, origin2) in list(waiting[origin].get(head, ())):
+                        add((head2, body2, dot2 + 1, origin2))
+
+        for (head, body, dot, origin) in chart[n]:
+            if head == start and dot == len(body) and origin == 0:
+                return True
+        return False
+
+
+class CompiledGrammar:
+
+    def __init__(self, grammar):
+        """Initialize rule tables of a grammar in Chomsky Normal Form with nonterminals numbered 0..m-1.
+        Rule indices are the positions in grammar.Rules.
+        Parameters:
+        grammar: FAdo CNF (grammar in Chomskey Normal From)"""
+
+        self.grammar = grammar
+        self.snapshot = CompiledGrammar.get_snapshot(grammar)
+        self.start_symbol = grammar.Start
+
+        epsilon = common.Epsilon
+        symbols = set()
+        for head, body in grammar.Rules:
+            symbols.add(head)
+            if isinstance(body, (tuple, list)) and len(body) == 2:
+                symbols.update(body)
+        self.nonterminals = sorted(symbols)
+        self.index = dict()
+        for i, A in enumerate(self.nonterminals):
+            self.index[A] = i
+        self.start = self.index[grammar.Start]
+
+        m = len(self.nonterminals)
+        self.rules = []
+        terminal_heads = dict()
+        binary_heads = dict()
+        epsilon_heads = []
+        self.left_rules = [[] for A in range(m)]
+        self.right_rules = [[] for A in range(m)]
+        self.head_rules = [[] for A in range(m)]
+        for i, (head, body) in enumerate(grammar.Rules):
+            A = self.index[head]
+            if isinstance(body, (tuple, list)) and len(body) == 2:
+                B = self.index[body[0]]
+                C = self.index[body[1]]
+                self.rules.append((A, (B, C)))
+                binary_heads.setdefault((B, C), []).append(A)
+                self.left_rules[B].append((A, C, i))
+                self.right_rules[C].append((A, B, i))
+                self.head_rules[A].append((B, C, i))
+            elif body == epsilon or body == [epsilon]:
+                self.rules.append((A, epsilon))
+                if A == self.start:
+                    epsilon_heads.append(A)
+            else:
+                self.rules.append((A, body))
+                terminal_heads.setdefault(body, []).append(A)
+
+        self.terminal_heads = dict()
+        for a in terminal_heads:
+            self.terminal_heads[a] = array('i', sorted(set(terminal_heads[a])))
+        self.binary_heads = dict()
+        for BC in binary_heads:
+            self.binary_heads[BC] = array('i', sorted(set(binary_heads[BC])))
+        self.epsilon_heads = array('i', epsilon_heads)
+
+    def is_current(self, grammar):
+        """Tests if tables still belong to grammar and grammar has the same rules and start symbol.
+        Parameters:
+        grammar: FAdo CNF (grammar in Chomskey Normal From)
+
+        Returns:
+        bool (whether tables can be reused for grammar)"""
+
+        if self.grammar is not grammar:
+            return False
+        return self.snapshot == CompiledGrammar.get_snapshot(grammar) and self.start_symbol == grammar.Start
+
+    @staticmethod
+    def get_snapshot(grammar):
+        """Computes immutable copy of the rules of grammar, used to detect changed rules.
+        Parameters:
+        grammar: FAdo CNF (grammar in Chomskey Normal From)
+
+        Returns:
+        snapshot : tuple (tuples (head, body) in the order of grammar.Rules)"""
+
+        snapshot = []
+        for head, body in grammar.Rules:
+            if isinstance(body, list):
+                body = tuple(body)
+            snapshot.append((head, body))
+        return tuple(snapshot)
+
+
+class RuleIndex:
+
+    def __init__(self, grammar):
+        """Initialize reverse-rule index (body -> heads), nullable nonterminals and rule bodies of a grammar.
+        Parameters:
+        grammar: FAdo CFGrammar"""
+
+        self.grammar = grammar
+        self.snapshot = CompiledGrammar.get_snapshot(grammar)
+        self.start_symbol = grammar.Start
+
+        self.reverse = GrammarHelper.get_reverse_rules(grammar)
+        self.nullable = GrammarHelper.get_nullable(grammar)
+
+        self.binary = dict()
+        self.unit = dict()
+        for body, heads in self.reverse.items():
+            if isinstance(body, tuple) and len(body) == 2:
+                (B, C) = body
+                self.binary.setdefault(B, dict())[C] = heads
+                if C in self.nullable:
+                    self.unit.setdefault(B, set()).update(heads)
+                if B in self.nullable:
+                    self.unit.setdefault(C, set()).update(heads)
+
+        epsilon = common.Epsilon
+        self.bodies = dict()
+        for head, body in grammar.Rules:
+            if isinstance(body, (tuple, list)):
+                symbols = tuple([symbol for symbol in body if symbol != epsilon])
+            elif body == epsilon:
+                symbols = ()
+            else:
+                symbols = (body,)
+            self.bodies.setdefault(head, set()).add(symbols)
+
+    def is_current(self, grammar):
+        """Tests if index still belongs to grammar and grammar has the same rules and start symbol.
+        Parameters:
+        grammar: FAdo CFGrammar
+
+        Returns:
+        bool (whether index can be reused for grammar)"""
+
+        if self.grammar is not grammar:
+            return False
+        return self.snapshot == CompiledGrammar.get_snapshot(grammar) and self.start_symbol == grammar.Start
@@ -1,6 +1,8 @@
 import networkx as nx
 import random
 import math
+import weakref
+from array import array
 
 
 class GraphGenerator:
@@ -80,12 +82,93 @@ class GraphGenerator:
             del source[key1]
             del sink[key1]
             k += 1
-        key = sp_list.keys()[0]
+        key = list(sp_list.keys())[0]
         SPG = sp_list[key]
         SPG = nx.convert_node_labels_to_integers(SPG)
         return SPG
 
 
+    @staticmethod
+    def random_weighted_spg__tree(number_of_edges, max_weight):
+        """Generates random weighted series-parallel graph together with its decomposition tree.
+        Components are composed like in random_weighted_spg, but merged terminals are tracked with union-find on
+        edge arrays, so the graph is only built once at the end.
+        Parameters:
+        number_of_edges: int (number of edges in the graph, at least 1)
+        max_weight : int (maximum weight for edges)
+
+        Returns:
+        SPG : NetworkX graph
+        tree : SPTree (decomposition tree of SPG, also returned by GraphHelper.get_sp_tree)"""
+
+        parent = list(range(2 * number_of_edges))
+
+        def find(node):
+            while parent[node] != node:
+                parent[node] = parent[parent[node]]
+                node = parent[node]
+            return node
+
+        tree = SPTree()
+        weights = array('l')
+        components = []
+        for i in range(0, number_of_edges):
+            weights.append(random.randint(1, max_weight))
+            leaf = tree.add_node('edge', [], 2 * i, 2 * i + 1, i)
+            components.append((2 * i, 2 * i + 1, leaf))
+
+        while len(components) > 1:
+            index = random.randrange(len(components))
+            components[index], components[-1] = components[-1], components[index]
+            (source1, sink1, current1) = components.pop()
+            index = random.randrange(len(components))
+            (source2, sink2, current2) = components[index]
+            if random.random() < 0.5:
+                parent[find(source2)] = find(sink1)
+                current = tree.compose('series', current1, current2, source1, sink2)
+                components[index] = (source1, sink2, current)
+            else:
+                parent[find(source1)] = find(source2)
+                parent[find(sink1)] = find(sink2)
+                current = tree.compose('parallel', current1, current2, source2, sink2)
+                components[index] = (source2, sink2, current)
+        (source, sink, tree.root) = components[0]
+
+        label = dict()
+        nodes = []
+        for node in range(2 * number_of_edges):
+            root = find(node)
+            if root not in label:
+                label[root] = len(label)
+            nodes.append(label[root])
+
+        SPG = nx.MultiDiGraph()
+        SPG.add_nodes_from(range(len(label)))
+        keys = dict()
+        edges = []
+        for i in range(0, number_of_edges):
+            (u, v) = (nodes[2 * i], nodes[2 * i + 1])
+            key = keys.get((u, v), 0)
+            keys[(u, v)] = key + 1
+            edges.append((u, v, key, {'weight': weights[i]}))
+        SPG.add_edges_from(edges)
+
+        tree.graph_id = id(SPG)
+        tree.number_of_nodes = SPG.number_of_nodes()
+        tree.number_of_edges = SPG.number_of_edges()
+        tree.source = nodes[source]
+        tree.sink = nodes[sink]
+        tree.order = tree.get_postorder()
+        for current in tree.order:
+            (u, v) = tree.ends[current]
+            tree.ends[current] = (nodes[u], nodes[v])
+            if tree.kind[current] == 'edge':
+                tree.edge[current] = edges[tree.edge[current]][:3]
+        GraphHelper.sp_trees[SPG] = tree
+
+        return SPG, tree
+
+
     @staticmethod
     def random_weighted_labeled_grid(m, n, max_weight, sigma=None):
         """Generates random weighted labeled grid graph.
@@ -160,11 +243,16 @@ class GraphGenerator:
         if sigma:
             for (u, v) in G.edges():
                 G[u][v]['label'] = random.choice(sigma)
+            GraphHelper.invalidate_label_index(G)
         return G
 
 
 class GraphHelper:
 
+    label_indices = weakref.WeakKeyDictionary()
+    sp_trees = weakref.WeakKeyDictionary()
+    transfer_matrices = weakref.WeakKeyDictionary()
+
     @staticmethod
     def get_all_nodes_in_rectangle(dic, x1, x2, y1, y2):
         """Computes all nodes in specified rectangle.
@@ -253,6 +341,46 @@ class GraphHelper:
 
         return G
 
+    @staticmethod
+    def get_min_weight_per_distance(G, dic):
+        """Computes minimum ratio of edge weight to geometric edge length.
+        Scaling geometric distances with this factor gives lower bounds for shortest path distances.
+        Parameters:
+        G : NetworkX graph
+        dic: dictionary (positions of the nodes)
+
+        Returns:
+        scale : float (minimum weight per unit distance)"""
+
+        scale = float('inf')
+        for u, v, d in G.edges(data=True):
+            geometric_dist = math.sqrt(((dic[u][0] - dic[v][0]) ** 2) + (dic[u][1] - dic[v][1]) ** 2)
+            if geometric_dist > 0:
+                scale = min(scale, d['weight'] / float(geometric_dist))
+
+        if scale == float('inf'):
+            scale = 0.0
+        return scale
+
+    @staticmethod
+    def get_euclidean_heuristic(dic, target, scale):
+        """Computes A* heuristic from geometric distances to target.
+        Parameters:
+        dic: dictionary (positions of the nodes)
+        target : node
+        scale : float (weight per unit distance, see get_min_weight_per_distance)
+
+        Returns:
+        heuristic : function (lower bound for the distance from a node to target)"""
+
+        x_target = dic[target][0]
+        y_target = dic[target][1]
+
+        def heuristic(node):
+            return scale * math.sqrt(((dic[node][0] - x_target) ** 2) + (dic[node][1] - y_target) ** 2)
+
+        return heuristic
+
     @staticmethod
     def merge_nodes(G, selected_nodes, new_node):
         """Merges selected_nodes into new_node.
@@ -370,4 +498,356 @@ class GraphHelper:
             new_pos[node] = pos[data['old']]
             del G.node[node]['old']
 
-        return G, new_pos
\ No newline at end of file
+        return G, new_pos
+
+
+    @staticmethod
+    def get_label_index(G):
+        """Returns label index of G, building it if there is none or it is out of date.
+        The index is kept in GraphHelper.label_indices and reused by later queries. It is not stored in G, so copies,
+        reversed graphs and pickles of G do not carry it along.
+        Labels changed with GraphHelper.set_label are patched into the index. Edges that were added, removed or
+        relabelled directly are detected by LabelIndex.is_current and the index is rebuilt.
+        Parameters:
+        G : NetworkX graph
+
+        Returns:
+        index : LabelIndex"""
+
+        index = GraphHelper.label_indices.get(G)
+        if index is None or not index.is_current(G):
+            index = LabelIndex(G)
+            GraphHelper.label_indices[G] = index
+        return index
+
+
+    @staticmethod
+    def invalidate_label_index(G):
+        """Drops label index and cached SPG transfer matrices of G, so the next query rebuilds them.
+        Parameters:
+        G : NetworkX graph"""
+
+        GraphHelper.label_indices.pop(G, None)
+        GraphHelper.transfer_matrices.pop(G, None)
+
+
+    @staticmethod
+    def set_label(G, u, v, label):
+        """Sets label of edge (u, v), patches the label index of G and drops its cached SPG transfer matrices.
+        Parameters:
+        G : NetworkX graph
+        u, v : node (edge to relabel)
+        label : (new label of the edge)"""
+
+        old_label = G[u][v].get('label')
+        G[u][v]['label'] = label
+
+        index = GraphHelper.label_indices.get(G)
+        if index is not None:
+            index.relabel_edge(u, v, old_label, label)
+        GraphHelper.transfer_matrices.pop(G, None)
+
+
+    @staticmethod
+    def get_sp_tree(G):
+        """Returns series-parallel decomposition tree of G, building it if there is none or it is out of date.
+        The tree is kept in GraphHelper.sp_trees and reused by later queries, like the label index.
+        Parameters:
+        G : NetworkX graph
+
+        Returns:
+        tree : SPTree"""
+
+        tree = GraphHelper.sp_trees.get(G)
+        if tree is None or not tree.is_current(G):
+            tree = SPTree(G)
+            GraphHelper.sp_trees[G] = tree
+        return tree
+
+
+class LabelIndex:
+
+    def __init__(self, G):
+        """Initialize a label-indexed adjacency index (node -> label -> successors/predecessors) for graph G.
+        Parameters:
+        G : NetworkX graph"""
+
+        self.graph_id = id(G)
+        self.number_of_nodes = G.number_of_nodes()
+
+        self.successors = dict()
+        self.predecessors = dict()
+        for node in G.nodes():
+            self.successors[node] = dict()
+            self.predecessors[node] = dict()
+        for u, v, data in G.edges(data=True):
+            self.add_edge(u, v, data.get('label'))
+
+        self.multigraph = G.is_multigraph()
+        self.labels = dict()
+        for u in G.adj:
+            labels = dict()
+            for v in G.adj[u]:
+                labels[v] = LabelIndex.get_edge_label(G.adj[u][v], self.multigraph)
+            self.labels[u] = labels
+
+    @staticmethod
+    def get_edge_label(data, multigraph):
+        """Computes label of the edges between two nodes as stored in the index.
+        Parameters:
+        data : dictionary (edge data, for multigraphs keyed by edge key)
+        multigraph : bool (whether data belongs to a multigraph)
+
+        Returns:
+        label : (label of the edge, dictionary of labels by edge key for multigraphs)"""
+
+        if multigraph:
+            labels = dict()
+            for key in data:
+                labels[key] = data[key].get('label')
+            return labels
+        return data.get('label')
+
+    def is_current(self, G):
+        """Tests if index still belongs to G and G has the same nodes and edges with the same labels.
+        Every edge of G is looked up once in the index, which is much cheaper than rebuilding the index.
+        Parameters:
+        G : NetworkX graph
+
+        Returns:
+        bool (whether index can be reused for G)"""
+
+        if self.graph_id != id(G) or self.number_of_nodes != G.number_of_nodes():
+            return False
+
+        adj = G.adj
+        for u in adj:
+            labels = self.labels.get(u)
+            neighbors = adj[u]
+            if labels is None or len(labels) != len(neighbors):
+                return False
+            for v in neighbors:
+                if v not in labels:
+                    return False
+                if self.multigraph:
+                    if labels[v] != LabelIndex.get_edge_label(neighbors[v], True):
+                        return False
+                elif labels[v] != neighbors[v].get('label'):
+                    return False
+        return True
+
+    def add_edge(self, u, v, label):
+        """Adds edge (u, v) with label to the index.
+        Parameters:
+        u, v : node
+        label : (label of the edge)"""
+
+        for node in (u, v):
+            if node not in self.successors:
+                self.successors[node] = dict()
+                self.predecessors[node] = dict()
+
+        labels = self.successors[u]
+        if label not in labels:
+            labels[label] = set()
+        labels[label].add(v)
+
+        labels = self.predecessors[v]
+        if label not in labels:
+            labels[label] = set()
+        labels[label].add(u)
+
+    def remove_edge(self, u, v, label):
+        """Removes edge (u, v) with label from the index.
+        Parameters:
+        u, v : node
+        label : (label of the edge)"""
+
+        labels = self.successors[u]
+        labels[label].discard(v)
+        if not labels[label]:
+            del labels[label]
+
+        labels = self.predecessors[v]
+        labels[label].discard(u)
+        if not labels[label]:
+            del labels[label]
+
+    def relabel_edge(self, u, v, old_label, new_label):
+        """Moves edge (u, v) from old_label to new_label.
+        Parameters:
+        u, v : node
+        old_label : (previous label of the edge)
+        new_label : (new label of the edge)"""
+
+        self.remove_edge(u, v, old_label)
+        self.add_edge(u, v, new_label)
+        self.labels[u][v] = new_label
+
+
+class SPTree:
+
+    def __init__(self, G=None):
+        """Initialize series-parallel decomposition tree of the two-terminal SPG G.
+        The tree is built by repeated series and parallel reductions and G is not changed.
+        Tree nodes are integers; kind[t] is 'edge', 'series' or 'parallel', children[t] lists the children of t in
+        path order, ends[t] is the pair of terminals of t and edge[t] is the edge (u, v, key) of a leaf t.
+        Parameters:
+        G : NetworkX graph, optional (default = None; If None an empty tree is created)"""
+
+        self.graph_id = None
+        self.number_of_nodes = 0
+        self.number_of_edges = 0
+        self.kind = []
+        self.children = []
+        self.ends = []
+        self.edge = []
+        self.source = None
+        self.sink = None
+        self.root = None
+        self.order = []
+
+        if G is not None:
+            self.build(G)
+
+    def build(self, G):
+        """Reduces G to a single edge and records the reductions as tree nodes.
+        Parameters:
+        G : NetworkX graph"""
+
+        self.graph_id = id(G)
+        self.number_of_nodes = G.number_of_nodes()
+        self.number_of_edges = G.number_of_edges()
+
+        sources = [node for node in G.nodes() if G.in_degree(node) == 0]
+        sinks = [node for node in G.nodes() if G.out_degree(node) == 0]
+        if len(sources) != 1 or len(sinks) != 1 or self.number_of_edges == 0:
+            raise ValueError("Graph is not a two-terminal series-parallel graph.")
+        self.source = sources[0]
+        self.sink = sinks[0]
+
+        successors = dict()
+        predecessors = dict()
+        for node in G.nodes():
+            successors[node] = dict()
+            predecessors[node] = dict()
+
+        if G.is_multigraph():
+            edges = G.edges(keys=True)
+        else:
+            edges = [(u, v, None) for u, v in G.edges()]
+        for u, v, key in edges:
+            if u == v:
+                raise ValueError("Graph is not a two-terminal series-parallel graph.")
+            leaf = self.add_node('edge', [], u, v, (u, v, key))
+            self.connect(successors, predecessors, u, v, leaf)
+
+        stack = [node for node in G.nodes() if node != self.source and node != self.sink]
+        while stack:
+            node = stack.pop()
+            if node not in successors or len(predecessors[node]) != 1 or len(successors[node]) != 1:
+                continue
+            (u, first), = predecessors[node].items()
+            (v, second), = successors[node].items()
+            del successors[u][node]
+            del predecessors[v][node]
+            del successors[node]
+            del predecessors[node]
+
+            current = self.compose('series', first, second, u, v)
+            self.connect(successors, predecessors, u, v, current)
+            for node in (u, v):
+                if node != self.source and node != self.sink:
+                    stack.append(node)
+
+        if len(successors) != 2 or list(successors[self.source].keys()) != [self.sink]:
+            raise ValueError("Graph is not a two-terminal series-parallel graph.")
+        self.root = successors[self.source][self.sink]
+        self.order = self.get_postorder()
+
+    def add_node(self, kind, children, u, v, edge=None):
+        """Adds tree node.
+        Parameters:
+        kind : string ('edge', 'series' or 'parallel')
+        children : list (children of the tree node)
+        u, v : node (terminals of the tree node)
+        edge : tuple, optional (default = None; edge (u, v, key) of a leaf)
+
+        Returns:
+        current : int (new tree node)"""
+
+        self.kind.append(kind)
+        self.children.append(children)
+        self.ends.append((u, v))
+        self.edge.append(edge)
+        return len(self.kind) - 1
+
+    def compose(self, kind, first, second, u, v):
+        """Composes two tree nodes in series or parallel. Children of the same kind are merged into one tree node.
+        Parameters:
+        kind : string ('series' or 'parallel')
+        first, second : int (tree nodes to compose, in path order for series composition)
+        u, v : node (terminals of the composition)
+
+        Returns:
+        current : int (composed tree node)"""
+
+        if self.kind[first] == kind:
+            current = first
+            self.ends[current] = (u, v)
+        else:
+            current = self.add_node(kind, [first], u, v)
+        if self.kind[second] == kind:
+            self.children[current].extend(self.children[second])
+        else:
+            self.children[current].append(second)
+        return current
+
+    def connect(self, successors, predecessors, u, v, current):
+        """Inserts tree node as virtual edge (u, v), composing it in parallel with an existing one.
+        Parameters:
+        successors : dict (node -> successor -> tree node)
+        predecessors : dict (node -> predecessor -> tree node)
+        u, v : node (terminals of current)
+        current : int (tree node)"""
+
+        if v in successors[u]:
+            current = self.compose('parallel', successors[u][v], current, u, v)
+        successors[u][v] = current
+        predecessors[v][u] = current
+
+    def get_postorder(self):
+        """Computes tree nodes reachable from root with children before their parents.
+        Returns:
+        order : list (tree nodes in post-order)"""
+
+        order = []
+        stack = [self.root]
+        while stack:
+            current = stack.pop()
+            order.append(current)
+            stack.extend(self.children[current])
+        order.reverse()
+        return order
+
+    def is_current(self, G):
+        """Tests if tree still belongs to G and G has the same nodes and edges.
+        Parameters:
+        G : NetworkX graph
+
+        Returns:
+        bool (whether tree can be reused for G)"""
+
+        if self.graph_id != id(G):
+            return False
+        if self.number_of_nodes != G.number_of_nodes() or self.number_of_edges != G.number_of_edges():
+            return False
+
+        multigraph = G.is_multigraph()
+        for current in self.order:
+            if self.kind[current] != 'edge':
+                continue
+            (u, v, key) = self.edge[current]
+            if u not in G.adj or v not in G.adj[u] or (multigraph and key not in G.adj[u][v]):
+                return False
+        return True
@@ -0,0 +1,206 @@
+import random
+import pickle
+from array import array
+from shortestpath import Dijkstra
+
+
+class Landmarks:
+
+    def __init__(self, nodes, landmarks, forward, backward):
+        """Initialize landmark tables.
+        Parameters:
+        nodes : list (nodes of the graph, position in list is index into the distance arrays)
+        landmarks : list (landmark nodes)
+        forward : list of arrays (forward[i][j] is the distance from landmarks[i] to nodes[j])
+        backward : list of arrays (backward[i][j] is the distance from nodes[j] to landmarks[i])"""
+
+        self.nodes = nodes
+        self.index = dict()
+        for i, node in enumerate(nodes):
+            self.index[node] = i
+        self.landmarks = landmarks
+        self.forward = forward
+        self.backward = backward
+
+    @staticmethod
+    def preprocess(G, k, method='farthest'):
+        """Selects k landmarks and computes distances from and to them.
+        Parameters:
+        G : NetworkX graph
+        k : int (number of landmarks)
+        method : string, optional (default = 'farthest'; 'farthest' or 'avoid' landmark selection)
+
+        Returns:
+        landmarks : Landmarks"""
+
+        nodes = G.nodes()
+        reverse = G.reverse(copy=True)
+        landmarks = Landmarks(nodes, [], [], [])
+
+        for i in range(min(k, len(nodes))):
+            if method == 'farthest' or i == 0:
+                landmark = landmarks.select_farthest(G)
+            elif method == 'avoid':
+                landmark = landmarks.select_avoid(G)
+            else:
+                raise ValueError("Unknown landmark selection %s." % method)
+            if landmark is None:
+                break
+            landmarks.add_landmark(G, reverse, landmark)
+
+        return landmarks
+
+    def add_landmark(self, G, reverse, landmark):
+        """Adds landmark and computes its distance arrays.
+        Parameters:
+        G : NetworkX graph
+        reverse : NetworkX graph (G with all edges reversed)
+        landmark : node"""
+
+        (dist, pred) = Dijkstra.s_shortest_path_heap(G, landmark)
+        forward = array('d', [float('inf')]) * len(self.nodes)
+        for node in dist:
+            forward[self.index[node]] = dist[node]
+
+        (dist, pred) = Dijkstra.s_shortest_path_heap(reverse, landmark)
+        backward = array('d', [float('inf')]) * len(self.nodes)
+        for node in dist:
+            backward[self.index[node]] = dist[node]
+
+        self.landmarks.append(landmark)
+        self.forward.append(forward)
+        self.backward.append(backward)
+
+    def select_farthest(self, G):
+        """Selects node that is farthest away from the current landmarks.
+        Without landmarks the node farthest from a random node is taken.
+        Nodes that cannot be reached from any landmark are ignored.
+        Parameters:
+        G : NetworkX graph
+
+        Returns:
+        landmark : node (None if there is no candidate left)"""
+
+        if not self.landmarks:
+            (dist, pred) = Dijkstra.s_shortest_path_heap(G, random.choice(self.nodes))
+            return max(dist, key=lambda node: dist[node])
+
+        landmarks = set(self.landmarks)
+        landmark = None
+        max_dist = -1
+        for j, node in enumerate(self.nodes):
+            if node in landmarks:
+                continue
+            dists = [forward[j] for forward in self.forward if forward[j] < float('inf')]
+            if not dists:
+                continue
+            current_dist = min(dists)
+            if current_dist > max_dist:
+                landmark = node
+                max_dist = current_dist
+        return landmark
+
+    def select_avoid(self, G):
+        """Selects landmark with the avoid heuristic: a shortest path tree is grown from a random root and each
+        node is weighted by the gap between its distance and the current lower bound. The search then descends
+        into the heaviest subtree without landmark down to a leaf.
+        Parameters:
+        G : NetworkX graph
+
+        Returns:
+        landmark : node"""
+
+        root = random.choice(self.nodes)
+        (dist, pred) = Dijkstra.s_shortest_path_heap(G, root)
+        heuristic = self.get_heuristic(root, reverse=True)
+
+        children = dict()
+        for node in dist:
+            children[node] = []
+        for node in pred:
+            children[pred[node]].append(node)
+
+        order = [root]
+        for node in order:
+            order.extend(children[node])
+
+        landmarks = set(self.landmarks)
+        size = dict()
+        for node in reversed(order):
+            if node in landmarks or any([size[child] is None for child in children[node]]):
+                size[node] = None
+            else:
+                size[node] = dist[node] - heuristic(node) + sum([size[child] for child in children[node]])
+
+        node = root
+        while True:
+            candidates = [child for child in children[node] if size[child] is not None]
+            if not candidates:
+                break
+            node = max(candidates, key=lambda child: size[child])
+
+        if node in landmarks:
+            return self.select_farthest(G)
+        return node
+
+    def get_heuristic(self, target, reverse=False):
+        """Computes ALT lower bound based on the triangle inequality.
+        Nodes that provably cannot reach the target (or cannot be reached from it if reverse) get bound infinity,
+        which keeps the bound consistent on graphs where not every node reaches every landmark.
+        Parameters:
+        target : node
+        reverse : bool, optional (default = False; If True the bound is for the distance from target to a node)
+
+        Returns:
+        heuristic : function (lower bound for the distance from a node to target)"""
+
+        t = self.index[target]
+        inf = float('inf')
+        bounds = []
+        for forward, backward in zip(self.forward, self.backward):
+            bounds.append((forward, backward, forward[t], backward[t]))
+
+        def heuristic(node):
+            j = self.index[node]
+            bound = 0
+            for forward, backward, forward_t, backward_t in bounds:
+                if forward[j] == inf or forward_t == inf:
+                    if reverse and forward[j] == inf and forward_t < inf:
+                        return inf
+                elif reverse and forward[j] - forward_t > bound:
+                    bound = forward[j] - forward_t
+                elif not reverse and forward_t - forward[j] > bound:
+                    bound = forward_t - forward[j]
+                if backward[j] == inf or backward_t == inf:
+                    if not reverse and backward[j] == inf and backward_t < inf:
+                        return inf
+                elif reverse and backward_t - backward[j] > bound:
+                    bound = backward_t - backward[j]
+                elif not reverse and backward[j] - backward_t > bound:
+                    bound = backward[j] - backward_t
+            return bound
+
+        return heuristic
+
+    def save(self, filename):
+        """Writes landmark tables to file.
+        Parameters:
+        filename : string"""
+
+        f = open(filename, 'wb')
+        pickle.dump((self.nodes, self.landmarks, self.forward, self.backward), f, 2)
+        f.close()
+
+    @staticmethod
+    def load(filename):
+        """Reads landmark tables from file.
+        Parameters:
+        filename : string
+
+        Returns:
+        landmarks : Landmarks"""
+
+        f = open(filename, 'rb')
+        (nodes, landmarks, forward, backward) = pickle.load(f)
+        f.close()
+        return Landmarks(nodes, landmarks, forward, backward)
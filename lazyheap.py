@@ -0,0 +1,67 @@
+import heapq
+import itertools
+
+
+class LazyHeap:
+
+    removed = object()
+
+    def __init__(self):
+        """Initialize a heapq based priority queue with lazy deletion."""
+
+        self.heapList = []
+        self.currentSize = 0
+        self.key = {}
+        self.entry = {}
+        self.counter = itertools.count()
+
+    def push(self, element, key):
+        """Pushes new entry for element onto the heap.
+        Parameters:
+        element : (element to push)
+        key : int (key value of element)"""
+
+        entry = [key, next(self.counter), element]
+        self.entry[element] = entry
+        heapq.heappush(self.heapList, entry)
+
+    def insert(self, element, key):
+        """Insert element into the heap
+        Parameters:
+        element : (element to insert into heap)
+        key : int (key value of element)"""
+
+        self.currentSize = self.currentSize + 1
+        self.key[element] = key
+        self.push(element, key)
+
+    def findMin(self):
+        """Computes element with minimum key value without removing it
+        Returns:
+        min : (element with min key value)"""
+
+        while self.heapList[0][2] is LazyHeap.removed:
+            heapq.heappop(self.heapList)
+        return self.heapList[0][2]
+
+    def extractMin(self):
+        """Computes element with minimum key value and removes it
+        Returns:
+        min : (element with min key value)"""
+
+        while True:
+            key, count, element = heapq.heappop(self.heapList)
+            if element is not LazyHeap.removed:
+                del self.entry[element]
+                self.currentSize = self.currentSize - 1
+                return element
+
+    def decreaseKey(self, element, key):
+        """Decreases key of element in the heap. The old entry stays in the heap and is skipped later.
+        Parameters:
+        element : (element to decrease key from)
+        key : int (new key value)"""
+
+        self.key[element] = key
+        self.entry[element][2] = LazyHeap.removed
+        self.push(element, key)
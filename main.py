@@ -13,6 +13,9 @@ from constrainedpath import REGLanguage, CFLanguage, KSimilarPath
 from reader import Reader
 from automaton import Automaton
 from shortestpath import Dijkstra, DAGraph, SPGraph
+from binheap import BinHeap
+from lazyheap import LazyHeap
+from radixheap import RadixHeap
 
 
 # Variables
@@ -757,21 +760,21 @@ elif choice == "h":
 
     (G, dic) = GraphGenerator.random_weighted_labeled_grid(m, n, max_weight, list(terminals))
 
-    D = CFLanguage.all_pair_cfg_shortest_path(G, grammar)
-
     while True:
         source = random.choice(G.nodes())
         target = random.choice(G.nodes())
 
         try:
             (dist_sp, path_sp) = Dijkstra.st_shortest_path_heap(G, source, target)
+            (dist, path) = CFLanguage.st_cfg_shortest_path(G, source, target, grammar)
         except nx.NetworkXNoPath:
             continue
 
-        dist = D[source][target][start]
+        break
 
-        if dist < float('inf'):
-            break
+    word = ''
+    for u, v in zip(path[:-1], path[1:]):
+        word += str(G[u][v]['label'])
 
     if print_results:
         print('CFG-ShP on NY')
@@ -779,7 +782,7 @@ elif choice == "h":
         print('The graph has ' + str(G.number_of_nodes()) + ' nodes and ' + str(G.number_of_edges()) + ' edges.')
         print('')
         print('Shortest Path has cost ' + str(dist_sp))
-        print('CFG-constrained Path has cost ' + str(dist)) #+ ' with label: ' + word)
+        print('CFG-constrained Path has cost ' + str(dist) + ' with label: ' + word)
 
 
 
@@ -1045,67 +1048,59 @@ elif choice == 'av_times_ny_ksim':
     f.write('\n')
     f.write('k;Total Time;Time KSimP;Dist KSimP;Nodes KSimP;Time ShP;Dist ShP;Nodes ShP\n')
 
-    for k in ks:
-        print('Starting k = ' + str(k) + ' at ' + time.strftime("%Y%m%d-%H%M%S"))
-
-        times = dict()
-        num_nodes = []
-        num_nodesk = []
-        dists = []
-        distsk = []
-
-        for l in range(i):
-            while True:
-                try:
-                    source = random.choice(G.nodes())
-                    target = random.choice(G.nodes())
+    print('Starting sweep up to k = ' + str(max(ks)) + ' at ' + time.strftime("%Y%m%d-%H%M%S"))
 
-                    (dist, distk, path, pathk, time1) = KSimilarPath.st_k_similar_path(G, source, target, k, timeit=True)
+    times = dict()
+    num_nodes = []
+    dists = []
+    num_nodesk = dict()
+    distsk = dict()
+    for k in ks:
+        num_nodesk[k] = []
+        distsk[k] = []
 
-                    num_nodes.append(len(path))
-                    num_nodesk.append(len(pathk))
-                    dists.append(dist)
-                    distsk.append(distk)
+    for l in range(i):
+        while True:
+            try:
+                source = random.choice(G.nodes())
+                target = random.choice(G.nodes())
 
-                    for label in time1:
-                        if label not in times:
-                            times[label] = []
-                        times[label].append(time1[label])
-                except nx.NetworkXNoPath:
+                (dist, path, curve, pathsk, time1) = KSimilarPath.st_k_similar_path__sweep(G, source, target, max(ks),
+                                                                                           paths=True, timeit=True)
+                if pathsk[min(ks)] is None:
                     continue
-                break
-
-        av_time = dict()
-        for label in times:
-            av_time[label] = sum(times[label]) / float(i)
 
-        dir = "Statistics"
-        if not os.path.exists(dir):
-            os.makedirs(dir)
-        timestr = time.strftime("%Y%m%d-%H%M%S")
-        name = 'av_ny_ksim_' + str(k) + '_' + timestr + '.csv'
-        name = re.sub(r'[\\/*?:"<>|]', '', name)
-        filepath = os.path.join(dir, name)
+                num_nodes.append(len(path))
+                dists.append(dist)
+                for k in ks:
+                    num_nodesk[k].append(len(pathsk[k]))
+                    distsk[k].append(curve[k])
+
+                for label in time1:
+                    if label not in times:
+                        times[label] = []
+                    times[label].append(time1[label])
+            except nx.NetworkXNoPath:
+                continue
+            break
 
-        f = open(filepath, 'w')
-        f.write('K-similar Path' + "\n")
-        f.write('\n')
-        f.write('Average' + ';' + 'values' + ';' + 'for' + ';' + str(i) + ';' + 'iterations:' + '\n')
-        f.write('\n')
-        f.write('k;Total Time;Time KSimP;Dist KSimP;Nodes KSimP;Time ShP;Dist ShP;Nodes ShP\n')
+    av_time = dict()
+    for label in times:
+        av_time[label] = sum(times[label]) / float(i)
 
+    for k in ks:
         f.write(str(k) + ';' +
                 "{0:.6f}".format(sum(av_time.values())) + ';' +
                 "{0:.6f}".format(av_time['KSimP'] + av_time['Labels']) + ';' +
-                "{0:.6f}".format(sum(distsk) / float(i)) + ';' +
-                "{0:.6f}".format(sum(num_nodesk) / float(i)) + ';' +
+                "{0:.6f}".format(sum(distsk[k]) / float(i)) + ';' +
+                "{0:.6f}".format(sum(num_nodesk[k]) / float(i)) + ';' +
                 "{0:.6f}".format(av_time['ShP']) + ';' +
                 "{0:.6f}".format(sum(dists) / float(i)) + ';' +
                 "{0:.6f}".format(sum(num_nodes) / float(i))+ "\n")
-        f.close()
+    f.close()
 
-        print('k = ' + str(k) + ' done' + ' at ' + time.strftime("%Y%m%d-%H%M%S"))
-        print('----------------------')
+    print('Sweep done' + ' at ' + time.strftime("%Y%m%d-%H%M%S"))
+    print('----------------------')
 
 
 
@@ -1138,51 +1133,58 @@ elif choice == 'av_times_ksim':
         f.write('\n')
         f.write('k;Total Time;Time KSimP;Dist KSimP;Nodes KSimP;Time ShP;Dist ShP;Nodes ShP\n')
 
+        times = dict()
+        num_nodes = []
+        dists = []
+        num_nodesk = dict()
+        distsk = dict()
         for k in ks:
-            print('Starting k = ' + str(k) + ' at ' + time.strftime("%Y%m%d-%H%M%S"))
-
-            times = dict()
-            num_nodes = []
-            num_nodesk = []
-            dists = []
-            distsk = []
-
-            j = 0
-            for l in range(i):
-                while True:
-                    if j >= 25:
-                        (G, dic) = GraphGenerator.random_weighted_labeled_grid(n, n, max_weight)
-                        (G, dic) = GraphHelper.convert_node_labels_to_integers(G, dic)
-                        j = 0
-                    try:
-                        source = random.choice(G.nodes())
-                        target = random.choice(G.nodes())
-
-                        (dist, distk, path, pathk, time1) = KSimilarPath.st_k_similar_path(G, source, target, k, timeit=True)
+            num_nodesk[k] = []
+            distsk[k] = []
 
-                        num_nodes.append(len(path))
-                        num_nodesk.append(len(pathk))
-                        dists.append(dist)
-                        distsk.append(distk)
+        j = 0
+        for l in range(i):
+            while True:
+                if j >= 25:
+                    (G, dic) = GraphGenerator.random_weighted_labeled_grid(n, n, max_weight)
+                    (G, dic) = GraphHelper.convert_node_labels_to_integers(G, dic)
+                    j = 0
+                try:
+                    source = random.choice(G.nodes())
+                    target = random.choice(G.nodes())
 
-                        for label in time1:
-                            if label not in times:
-                                times[label] = []
-                            times[label].append(time1[label])
-                    except nx.NetworkXNoPath:
+                    (dist, path, curve, pathsk, time1) = KSimilarPath.st_k_similar_path__sweep(G, source, target,
+                                                                                               max(ks), paths=True,
+                                                                                               timeit=True)
+                    if pathsk[min(ks)] is None:
                         j += 1
                         continue
-                    break
 
-            av_time = dict()
-            for label in times:
-                av_time[label] = sum(times[label]) / float(i)
+                    num_nodes.append(len(path))
+                    dists.append(dist)
+                    for k in ks:
+                        num_nodesk[k].append(len(pathsk[k]))
+                        distsk[k].append(curve[k])
+
+                    for label in time1:
+                        if label not in times:
+                            times[label] = []
+                        times[label].append(time1[label])
+                except nx.NetworkXNoPath:
+                    j += 1
+                    continue
+                break
 
+        av_time = dict()
+        for label in times:
+            av_time[label] = sum(times[label]) / float(i)
+
+        for k in ks:
             f.write(str(k) + ';' +
                     "{0:.6f}".format(sum(av_time.values())) + ';' +
                     "{0:.6f}".format(av_time['KSimP'] + av_time['Labels']) + ';' +
-                    "{0:.6f}".format(sum(distsk) / float(i)) + ';' +
-                    "{0:.6f}".format(sum(num_nodesk) / float(i)) + ';' +
+                    "{0:.6f}".format(sum(distsk[k]) / float(i)) + ';' +
+                    "{0:.6f}".format(sum(num_nodesk[k]) / float(i)) + ';' +
                     "{0:.6f}".format(av_time['ShP']) + ';' +
                     "{0:.6f}".format(sum(dists) / float(i)) + ';' +
                     "{0:.6f}".format(sum(num_nodes) / float(i))+ "\n")
@@ -1226,7 +1228,7 @@ elif choice == 'av_times_cfg':
     f.write('Graph G ' + ';' + str(m*n) + ' nodes\n')
     f.write('Language: ' + ';' + 'L={x^n z y^n}')
     f.write('\n')
-    f.write('Time CFG-ShP\n')
+    f.write('Time CFG-ShP;Time CFG-ShP worklist;Time CFG-ShP parallel\n')
 
     for k in range(i):
         print('Starting Iteration ' + str(k + 1) + ' at ' + time.strftime("%Y%m%d-%H%M%S"))
@@ -1237,8 +1239,13 @@ elif choice == 'av_times_cfg':
         t1 = time.clock()
         D = CFLanguage.all_pair_cfg_shortest_path(G, grammar)
         t2 = time.clock()
+        D = CFLanguage.all_pair_cfg_shortest_path__worklist(G, grammar)
+        t3 = time.clock()
+        t4 = time.time()
+        (nodes, M) = CFLanguage.all_pair_cfg_shortest_path__parallel(G, grammar)
+        t5 = time.time()
 
-        f.write("{0:.6f}".format(t2-t1) + "\n")
+        f.write("{0:.6f}".format(t2-t1) + ';' + "{0:.6f}".format(t3-t2) + ';' + "{0:.6f}".format(t5-t4) + "\n")
     f.close()
 
 elif choice == 'av_times_sp':
@@ -1279,4 +1286,113 @@ elif choice == 'av_times_sp':
         t2 = time.clock()
 
         f.write("{0:.6f}".format(t2-t1) + "\n")
-    f.close()
\ No newline at end of file
+    f.close()
+
+elif choice == 'av_times_heaps':
+    # Variables
+    string = '(b+bab)*+a*'
+    sizes = [10, 25, 50, 75, 100]
+    queues = [('BinHeap', BinHeap), ('LazyHeap', LazyHeap), ('RadixHeap', RadixHeap)]
+    i = iterations1
+    max_weight = max_weight1
+
+    regex = str2regexp(string)
+    sigma = list(regex.setOfSymbols())
+
+    dir = "Statistics"
+    if not os.path.exists(dir):
+        os.makedirs(dir)
+    timestr = time.strftime("%Y%m%d-%H%M%S")
+    name = 'av_times_heaps_' + timestr + '.csv'
+    filepath = os.path.join(dir, name)
+
+    f = open(filepath, 'w')
+    f.write('Regexp: ' + ';' + string + "\n")
+    f.write('Average;times;for;' + str(i) + ';iterations:' + '\n')
+    f.write('\n')
+    f.write('N;Queue;Time ShP;Time REG-ShP\n')
+
+    for n in sizes:
+        print('Starting size ' + str(n*n) + ' at ' + time.strftime("%Y%m%d-%H%M%S"))
+
+        (G, dic) = GraphGenerator.random_weighted_labeled_grid(n, n, max_weight, sigma)
+        (G, dic) = GraphHelper.convert_node_labels_to_integers(G, dic)
+
+        pairs = []
+        while len(pairs) < i:
+            source = random.choice(G.nodes())
+            target = random.choice(G.nodes())
+            try:
+                REGLanguage.st_reg_shortest_path(G, source, target, string)
+            except nx.NetworkXNoPath:
+                continue
+            pairs.append((source, target))
+
+        for queue_name, queue in queues:
+            t1 = time.clock()
+            for source, target in pairs:
+                (dist, path) = Dijkstra.st_shortest_path_heap(G, source, target, queue)
+            t2 = time.clock()
+            for source, target in pairs:
+                (dist, path) = REGLanguage.st_reg_shortest_path(G, source, target, string, queue=queue)
+            t3 = time.clock()
+
+            f.write(str(G.number_of_nodes()) + ';' + queue_name + ';' +
+                    "{0:.6f}".format((t2 - t1) / float(i)) + ';' +
+                    "{0:.6f}".format((t3 - t2) / float(i)) + "\n")
+
+        print('Size ' + str(n*n) + ' done' + ' at ' + time.strftime("%Y%m%d-%H%M%S"))
+    f.close()
+
+elif choice == 'av_times_spg':
+    # Variables
+    string = '(b+bab)*+a*'
+    sizes = [1000, 10000, 100000]
+    i = iterations1
+    max_weight = max_weight1
+
+    regex = str2regexp(string)
+    sigma = list(regex.setOfSymbols())
+
+    dir = "Statistics"
+    if not os.path.exists(dir):
+        os.makedirs(dir)
+    timestr = time.strftime("%Y%m%d-%H%M%S")
+    name = 'av_times_spg_' + timestr + '.csv'
+    filepath = os.path.join(dir, name)
+
+    f = open(filepath, 'w')
+    f.write('Regexp: ' + ';' + string + "\n")
+    f.write('Average;times;for;' + str(i) + ';iterations:' + '\n')
+    f.write('\n')
+    f.write('Edges;Time Generate;Time SPG-ShP;Time SPG-REG-ShP\n')
+
+    for n in sizes:
+        print('Starting size ' + str(n) + ' at ' + time.strftime("%Y%m%d-%H%M%S"))
+
+        times = [0.0, 0.0, 0.0]
+        for k in range(i):
+            t1 = time.clock()
+            (G, tree) = GraphGenerator.random_weighted_spg__tree(n, max_weight)
+            t2 = time.clock()
+            for u, v, key, data in G.edges(keys=True, data=True):
+                data['label'] = random.choice(sigma)
+            GraphHelper.invalidate_label_index(G)
+
+            t3 = time.clock()
+            (dist, path) = SPGraph.st_shortest_path__tree(G, tree.source, tree.sink)
+            t4 = time.clock()
+            try:
+                (dist, path) = REGLanguage.st_reg_shortest_path__spg(G, tree.source, tree.sink, string)
+            except nx.NetworkXNoPath:
+                pass
+            t5 = time.clock()
+
+            times[0] += t2 - t1
+            times[1] += t4 - t3
+            times[2] += t5 - t4
+
+        f.write(str(n) + ';' + ';'.join(["{0:.6f}".format(t / float(i)) for t in times]) + "\n")
+
+        print('Size ' + str(n) + ' done' + ' at ' + time.strftime("%Y%m%d-%H%M%S"))
+    f.close()
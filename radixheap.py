@@ -0,0 +1,100 @@
+import heapq
+import numbers
+from lazyheap import LazyHeap
+
+
+class RadixHeap(LazyHeap):
+
+    def __init__(self):
+        """Initialize a monotone radix heap for integer keys.
+        Falls back to a heapq based queue (LazyHeap) as soon as a non-integer key or a key smaller than
+        the last extracted one is inserted."""
+
+        LazyHeap.__init__(self)
+        self.integer = True
+        self.last = 0
+        self.buckets = [[]]
+
+    def bucketIndex(self, key):
+        """Computes bucket of key relative to the last extracted key.
+        Parameters:
+        key : int (key value)
+
+        Returns:
+        : int (index of bucket)"""
+
+        return (key ^ self.last).bit_length()
+
+    def push(self, element, key):
+        """Pushes new entry for element into its bucket.
+        Parameters:
+        element : (element to push)
+        key : int (key value of element)"""
+
+        if self.integer and (not isinstance(key, numbers.Integral) or key < self.last):
+            self.fallback()
+        if not self.integer:
+            LazyHeap.push(self, element, key)
+            return
+
+        key = int(key)
+        entry = [key, next(self.counter), element]
+        self.entry[element] = entry
+        i = self.bucketIndex(key)
+        while len(self.buckets) <= i:
+            self.buckets.append([])
+        self.buckets[i].append(entry)
+
+    def fallback(self):
+        """Moves all entries from the buckets into a heapq based heap."""
+
+        self.integer = False
+        self.heapList = [entry for bucket in self.buckets for entry in bucket if entry[2] is not LazyHeap.removed]
+        heapq.heapify(self.heapList)
+        self.buckets = [[]]
+
+    def refill(self):
+        """Makes sure the first bucket holds a valid entry by redistributing the first non-empty bucket."""
+
+        bucket = self.buckets[0]
+        while bucket and bucket[-1][2] is LazyHeap.removed:
+            bucket.pop()
+        if bucket:
+            return
+
+        i = 1
+        while True:
+            entries = [entry for entry in self.buckets[i] if entry[2] is not LazyHeap.removed]
+            self.buckets[i] = []
+            if entries:
+                break
+            i += 1
+
+        self.last = min([entry[0] for entry in entries])
+        for entry in entries:
+            self.buckets[self.bucketIndex(entry[0])].append(entry)
+
+    def findMin(self):
+        """Computes element with minimum key value without removing it
+        Returns:
+        min : (element with min key value)"""
+
+        if not self.integer:
+            return LazyHeap.findMin(self)
+
+        self.refill()
+        return self.buckets[0][-1][2]
+
+    def extractMin(self):
+        """Computes element with minimum key value and removes it
+        Returns:
+        min : (element with min key value)"""
+
+        if not self.integer:
+            return LazyHeap.extractMin(self)
+
+        self.refill()
+        key, count, element = self.buckets[0].pop()
+        del self.entry[element]
+        self.currentSize = self.currentSize - 1
+        return element
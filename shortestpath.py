@@ -1,16 +1,32 @@
 import networkx as nx
 from binheap import BinHeap
+from graph import GraphHelper
 from math import isinf
 
 
 class Dijkstra:
 
     @staticmethod
-    def s_shortest_path(G, source):
+    def s_shortest_path(G, source, queue=BinHeap):
         """Compute shortest path from source to all nodes in the graph G.
         Parameters:
         G : NetworkX graph
         source : node (Starting node for path)
+        queue : class, optional (default = BinHeap; priority queue used to select the next node)
+
+        Returns:
+        dist: dict (dictionary of shortest path distances for each node)
+        pred: dict (dictionary of predecessors for each node)"""
+
+        return Dijkstra.s_shortest_path_heap(G, source, queue)
+
+    @staticmethod
+    def s_shortest_path_heap(G, source, queue=BinHeap):
+        """Compute shortest path from source to all nodes in the graph G using a heap as priority list.
+        Parameters:
+        G : NetworkX graph
+        source : node (Starting node for path)
+        queue : class, optional (default = BinHeap; priority queue used to select the next node)
 
         Returns:
         dist: dict (dictionary of shortest path distances for each node)
@@ -20,65 +36,75 @@ class Dijkstra:
         if G.is_multigraph():
             multigraph = 1
 
-        dist = {source: 0}
+        heap = queue()
+        heap.insert(source, 0)
         pred = {}
-        nodes = set(nx.nodes(G))
-
-        while nodes: 
-            min_node = None
-            for node in nodes:
-                if node in dist:
-                    if min_node is None:
-                        min_node = node
-                    elif dist[node] < dist[min_node]:
-                        min_node = node
-
-            if min_node is None:
-                return dist, pred
 
+        while heap.currentSize > 0:
+            min_node = heap.extractMin()
 
-            nodes.remove(min_node)
-            current_weight = dist[min_node]
+            current_weight = heap.key[min_node]
 
             if not multigraph:
                 for node in G.successors(min_node):
                     weight = current_weight + G[min_node][node]['weight']
-                    if node not in dist or weight < dist[node]:
-                        dist[node] = weight
+                    if node not in heap.key:
+                        heap.insert(node, weight)
+                        pred[node] = min_node
+                    elif weight < heap.key[node]:
+                        heap.decreaseKey(node, weight)
                         pred[node] = min_node
             else:
                 for node in G.successors(min_node):
                     for edge in G[min_node][node]:
                         weight = current_weight + G[min_node][node][edge]['weight']
-                        if node not in dist or weight < dist[node]:
-                            dist[node] = weight
+                        if node not in heap.key:
+                            heap.insert(node, weight)
+                            pred[node] = min_node
+                        elif weight < heap.key[node]:
+                            heap.decreaseKey(node, weight)
                             pred[node] = min_node
+        dist = heap.key
         return dist, pred
-    
+
     @staticmethod
-    def s_shortest_path_heap(G, source):
-        """Compute shortest path from source to all nodes in the graph G using a heap as priority list.
+    def st_shortest_path_heap(G, source, target, queue=BinHeap):
+        """Compute shortest path from source to target in the graph G using a heap as priority list.
+        Raises NetworkXNoPath exception when no path exists.
         Parameters:
         G : NetworkX graph
         source : node (Starting node for path)
+        target : node (Ending node for path)
+        queue : class, optional (default = BinHeap; priority queue used to select the next node)
 
         Returns:
-        dist: dict (dictionary of shortest path distances for each node)
-        pred: dict (dictionary of predecessors for each node)"""
+        dist: int (The length of the shortest path from the source to the target)
+        path: list (A single list of nodes in a shortest path from the source to the target)"""
+
+        if source == target:
+            return 0, [source]
 
         multigraph = 0
         if G.is_multigraph():
             multigraph = 1
 
-        heap = BinHeap()
-        heap.insert(source,0)
+        heap = queue()
+        heap.insert(source, 0)
         pred = {}
-        nodes = set(nx.nodes(G))
 
-        while heap.currentSize > 0: 
+        while heap.currentSize > 0:
             min_node = heap.extractMin()
+            if min_node == target:
+                dist = heap.key[target]
+                path = []
+                node = target
+                while True:
+                    path[:0] = [node]
+                    if node == source:
+                        break
+                    node = pred[node]
+                return dist, path
 
-            nodes.remove(min_node)
             current_weight = heap.key[min_node]
 
             if not multigraph:
@@ -100,40 +126,43 @@ class Dijkstra:
                         elif weight < heap.key[node]:
                             heap.decreaseKey(node, weight)
                             pred[node] = min_node
-        dist = heap.key
-        return dist, pred
+
+        raise nx.NetworkXNoPath("No path between %s and %s." % (source, target))
+
 
     @staticmethod
-    def st_shortest_path_heap(G, source, target):
-        """Compute shortest path from source to target in the graph G using a heap as priority list.
-        Raises NetworkXNoPath exception when no path exists.
+    def st_shortest_path_heap__targets(G, source, targets, queue=BinHeap):
+        """Compute shortest path from source to the closest of several targets in the graph G using a heap.
+        The search stops as soon as the first target is settled.
+        Raises NetworkXNoPath exception when no target is reachable.
         Parameters:
         G : NetworkX graph
         source : node (Starting node for path)
-        target : node (Ending node for path)
+        targets : iterable of nodes (Possible ending nodes for path)
+        queue : class, optional (default = BinHeap; priority queue used to select the next node)
 
         Returns:
-        dist: int (The length of the shortest path from the source to the target)
-        path: list (A single list of nodes in a shortest path from the source to the target)"""
+        dist: int (The length of the shortest path from the source to the closest target)
+        path: list (A single list of nodes in a shortest path from the source to the closest target)"""
 
-        if source == target:
+        targets = set(targets)
+        if source in targets:
             return 0, [source]
 
         multigraph = 0
         if G.is_multigraph():
             multigraph = 1
 
-        heap = BinHeap()
+        heap = queue()
         heap.insert(source, 0)
         pred = {}
-        nodes = set(nx.nodes(G))
 
         while heap.currentSize > 0:
             min_node = heap.extractMin()
-            if min_node == target:
-                dist = heap.key[target]
+            if min_node in targets:
+                dist = heap.key[min_node]
                 path = []
-                node = target
+                node = min_node
                 while True:
                     path[:0] = [node]
                     if node == source:
@@ -141,7 +170,6 @@ class Dijkstra:
                     node = pred[node]
                 return dist, path
 
-            nodes.remove(min_node)
             current_weight = heap.key[min_node]
 
             if not multigraph:
@@ -164,6 +192,69 @@ class Dijkstra:
                             heap.decreaseKey(node, weight)
                             pred[node] = min_node
 
+        raise nx.NetworkXNoPath("No path between %s and %s." % (source, list(targets)))
+
+
+    @staticmethod
+    def st_shortest_path_astar(G, source, target, heuristic, queue=BinHeap):
+        """Compute shortest path from source to target in the graph G using A* search.
+        The heuristic has to be a consistent lower bound on the distance to the target,
+        e.g. GraphHelper.get_euclidean_heuristic. Nodes with infinite bound are never queued.
+        Raises NetworkXNoPath exception when no path exists.
+        Parameters:
+        G : NetworkX graph
+        source : node (Starting node for path)
+        target : node (Ending node for path)
+        heuristic : function (lower bound for the distance from a node to target)
+        queue : class, optional (default = BinHeap; priority queue used to select the next node)
+
+        Returns:
+        dist: int (The length of the shortest path from the source to the target)
+        path: list (A single list of nodes in a shortest path from the source to the target)"""
+
+        if source == target:
+            return 0, [source]
+
+        multigraph = 0
+        if G.is_multigraph():
+            multigraph = 1
+
+        heap = queue()
+        heap.insert(source, heuristic(source))
+        dist = {source: 0}
+        pred = {}
+
+        while heap.currentSize > 0:
+            min_node = heap.extractMin()
+            if min_node == target:
+                path = []
+                node = target
+                while True:
+                    path[:0] = [node]
+                    if node == source:
+                        break
+                    node = pred[node]
+                return dist[target], path
+
+            current_weight = dist[min_node]
+
+            for node in G.successors(min_node):
+                if not multigraph:
+                    weight = current_weight + G[min_node][node]['weight']
+                else:
+                    weight = current_weight + min([d['weight'] for d in G[min_node][node].values()])
+                if node not in heap.key:
+                    estimate = heuristic(node)
+                    if isinf(estimate):
+                        continue
+                    dist[node] = weight
+                    heap.insert(node, weight + estimate)
+                    pred[node] = min_node
+                elif weight < dist[node]:
+                    dist[node] = weight
+                    heap.decreaseKey(node, weight + heuristic(node))
+                    pred[node] = min_node
+
         raise nx.NetworkXNoPath("No path between %s and %s." % (source, target))
 
 
@@ -280,4 +371,63 @@ class SPGraph:
                 path.insert(0, source)
                 return weight, path
             else:
-                raise nx.NetworkXNoPath("No path between %s and %s." % (source, target))
\ No newline at end of file
+                raise nx.NetworkXNoPath("No path between %s and %s." % (source, target))
+
+    @staticmethod
+    def st_shortest_path__tree(G, source, target):
+        """Compute shortest path from source to target in the SPG G bottom-up on its decomposition tree.
+        Runs in linear time and leaves G unchanged. If source and target are not the terminals of G the shortest
+        path is computed on the DAG G instead.
+        Parameters:
+        G : NetworkX graph
+        source : node (Starting node for path)
+        target : node (Ending node for path)
+
+        Returns:
+        dist: int (The length of the shortest path from the source to the target)
+        path: list (A single list of nodes in a shortest path from the source to the target)"""
+
+        if source == target:
+            return 0, [source]
+
+        tree = GraphHelper.get_sp_tree(G)
+        if source != tree.source or target != tree.sink:
+            (dist, pred) = DAGraph.s_shortest_path(G, source)
+            if target not in dist:
+                raise nx.NetworkXNoPath("No path between %s and %s." % (source, target))
+            path = [target]
+            while path[-1] != source:
+                path.append(pred[path[-1]])
+            path.reverse()
+            return dist[target], path
+
+        multigraph = G.is_multigraph()
+        dist = [0] * len(tree.kind)
+        choice = [None] * len(tree.kind)
+        for current in tree.order:
+            kind = tree.kind[current]
+            if kind == 'edge':
+                (u, v, key) = tree.edge[current]
+                if multigraph:
+                    dist[current] = G[u][v][key]['weight']
+                else:
+                    dist[current] = G[u][v]['weight']
+            elif kind == 'series':
+                dist[current] = sum([dist[child] for child in tree.children[current]])
+            else:
+                choice[current] = min(tree.children[current], key=lambda child: dist[child])
+                dist[current] = dist[choice[current]]
+
+        path = [source]
+        stack = [tree.root]
+        while stack:
+            current = stack.pop()
+            kind = tree.kind[current]
+            if kind == 'edge':
+                path.append(tree.ends[current][1])
+            elif kind == 'series':
+                stack.extend(reversed(tree.children[current]))
+            else:
+                stack.append(choice[current])
+
+        return dist[tree.root], path
@@ -1,7 +1,7 @@
 import unittest
 import random
 from graph import GraphGenerator, GraphHelper
-from automaton import Automaton
+from automaton import Automaton, RegexCache
 from FAdo.reex import *
 
 
@@ -208,6 +208,48 @@ class TestAutomaton(unittest.TestCase):
             self.assertTrue(i in automaton.States)
 
 
+    def test_compile_regex(self):
+        string = 'a*((b+cd)*+e)'
+        (automaton, table) = Automaton.compile_regex(string)
+
+        self.assertTrue(automaton.evalWordP("aaae"))
+        self.assertFalse(automaton.evalWordP("ee"))
+
+        for u in automaton.delta:
+            for symbol in automaton.delta[u]:
+                self.assertEqual(table[symbol][u], automaton.delta[u][symbol])
+        for symbol in table:
+            for u, v in enumerate(table[symbol]):
+                if v == -1:
+                    self.assertFalse(u in automaton.delta and symbol in automaton.delta[u])
+
+    def test_compile_regex__cached(self):
+        Automaton.regex_cache.clear()
+        string = '(b+bab)*+a*'
+
+        (automaton1, table1) = Automaton.compile_regex(string)
+        (automaton2, table2) = Automaton.compile_regex(string)
+        automaton3 = Automaton.regex_to_automaton(string)
+
+        self.assertTrue(automaton1 is automaton2)
+        self.assertFalse(automaton1 is automaton3)
+        self.assertEqual(automaton1.delta, automaton3.delta)
+        self.assertEqual(automaton1.Final, automaton3.Final)
+        self.assertTrue(table1 is table2)
+        self.assertEqual(Automaton.regex_cache.misses, 1)
+        self.assertEqual(Automaton.regex_cache.hits, 2)
+
+    def test_regex_to_automaton__copy(self):
+        Automaton.regex_cache.clear()
+        string = '(b+bab)*+a*'
+
+        automaton1 = Automaton.regex_to_automaton(string)
+        automaton1.complete()
+        (automaton2, table) = Automaton.compile_regex(string)
+
+        self.assertFalse(automaton1 is automaton2)
+        self.assertEqual(len(automaton2.States), len(table['a']))
+
     def test_product_automaton(self):
         G = GraphGenerator.random_weighted_graph(50, 1, 50)
         Sigma = ['a', 'b']
@@ -413,4 +455,40 @@ class TestAutomaton(unittest.TestCase):
                 for label in sigma:
                     if ((str(state[0]), label, str(to[0])) in transitionsG) and (
                                 (str(state[1]), label, str(to[1])) in transitionsR2):
-                        self.assertTrue(automaton2.hasTransitionP(state, label, to))
\ No newline at end of file
+                        self.assertTrue(automaton2.hasTransitionP(state, label, to))
+
+
+class TestRegexCache(unittest.TestCase):
+
+    def test_get(self):
+        cache = RegexCache(2)
+
+        self.assertEqual(cache.get('a*'), None)
+        cache.put('a*', 1)
+        self.assertEqual(cache.get('a*'), 1)
+        self.assertEqual(cache.hits, 1)
+        self.assertEqual(cache.misses, 1)
+
+    def test_put__evicts_least_recently_used(self):
+        cache = RegexCache(2)
+
+        cache.put('a*', 1)
+        cache.put('b*', 2)
+        cache.get('a*')
+        cache.put('c*', 3)
+
+        self.assertEqual(len(cache.entries), 2)
+        self.assertEqual(cache.get('b*'), None)
+        self.assertEqual(cache.get('a*'), 1)
+        self.assertEqual(cache.get('c*'), 3)
+
+    def test_clear(self):
+        cache = RegexCache(2)
+
+        cache.put('a*', 1)
+        cache.get('a*')
+        cache.clear()
+
+        self.assertEqual(len(cache.entries), 0)
+        self.assertEqual(cache.hits, 0)
+        self.assertEqual(cache.misses, 0)
@@ -77,6 +77,16 @@ class TestBinHeap(unittest.TestCase):
         self.assertEqual(heap.heapList, [0])
         self.assertEqual(min, 1)
 
+    def test_findMin(self):
+        heap = BinHeap()
+        heap.insert(1, 10)
+        heap.insert(2, 5)
+
+        min = heap.findMin()
+        self.assertEqual(min, 2)
+        self.assertEqual(heap.currentSize, 2)
+        self.assertEqual(heap.heapList, [0, 2, 1])
+
     def test_decreaseKey(self):
         heap = BinHeap()
         heap.insert(1, 10)
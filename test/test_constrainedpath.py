@@ -1,9 +1,15 @@
 import unittest
 import networkx as nx
+import numpy as np
 from graph import GraphGenerator, GraphHelper
 from FAdo.reex import *
 from FAdo.cfg import *
-from constrainedpath import REGLanguage, CFLanguage, KSimilarPath
+import constrainedpath
+from constrainedpath import REGLanguage, CFLanguage, KSimilarPath, CFLTable
+from automaton import Automaton
+from grammarhelper import GrammarHelper
+from lazyheap import LazyHeap
+from radixheap import RadixHeap
 
 
 class TestREGLanguage(unittest.TestCase):
@@ -185,6 +191,47 @@ class TestREGLanguage(unittest.TestCase):
                 continue
             break
 
+    def test_st_shortest_path__shared_transitions(self):
+        G = GraphGenerator.random_weighted_graph(60, 0.1, 50)
+        G = GraphGenerator.random_label(G, ['a', 'b', 'c'])
+        string = "(a+b)*c"
+
+        for i in range(20):
+            source = random.choice(G.nodes())
+            target = random.choice(G.nodes())
+
+            try:
+                (dist, path) = REGLanguage.st_reg_shortest_path(G, source, target, string)
+            except nx.NetworkXNoPath:
+                self.assertRaises(nx.NetworkXNoPath, REGLanguage.st_reg_shortest_path__encoded, G, source, target,
+                                  string)
+                continue
+            (dist2, path2) = REGLanguage.st_reg_shortest_path__encoded(G, source, target, string)
+
+            word = ''
+            for u, v in zip(path[:-1], path[1:]):
+                word += str(G[u][v]['label'])
+            self.assertEqual(dist, dist2)
+            self.assertTrue(str2regexp(string).evalWordP(word))
+
+    def test_st_shortest_path__changed_graph(self):
+        G = nx.DiGraph()
+        G.add_edge(0, 1, {'weight': 1, 'label': 'a'})
+        G.add_edge(1, 2, {'weight': 1, 'label': 'a'})
+        G.add_edge(0, 3, {'weight': 2, 'label': 'a'})
+        G.add_edge(3, 2, {'weight': 3, 'label': 'a'})
+        string = "aa"
+
+        self.assertEqual(REGLanguage.st_reg_shortest_path(G, 0, 2, string), (2, [0, 1, 2]))
+
+        G[0][1]['label'] = 'b'
+        self.assertEqual(REGLanguage.st_reg_shortest_path(G, 0, 2, string), (5, [0, 3, 2]))
+
+        G[0][1]['label'] = 'a'
+        G.remove_edge(1, 2)
+        G.add_edge(1, 4, {'weight': 1, 'label': 'a'})
+        self.assertEqual(REGLanguage.st_reg_shortest_path(G, 0, 2, string), (5, [0, 3, 2]))
+
     def test_compare_algorithms(self):
         while True:
             G = GraphGenerator.random_weighted_graph(100, 0.1, 50)
@@ -216,6 +263,223 @@ class TestREGLanguage(unittest.TestCase):
             break
 
 
+    def test_st_shortest_path__encoded(self):
+        while True:
+            G = GraphGenerator.random_weighted_graph(100, 0.1, 50)
+            sigma = ['a', 'b']
+            G = GraphGenerator.random_label(G, sigma)
+            string = "(b+bab)*+a*"
+
+            try:
+                source = random.choice(G.nodes())
+                target = random.choice(G.nodes())
+
+                (dist, path) = REGLanguage.st_reg_shortest_path__encoded(G, source, target, string)
+                (dist2, path2) = REGLanguage.st_reg_shortest_path(G, source, target, string)
+
+                self.assertEqual(path[0], source)
+                self.assertEqual(path[-1], target)
+
+                expected_dist = 0
+                word = []
+                for u, v in zip(path[:-1], path[1:]):
+                    self.assertTrue(G.has_edge(u, v))
+                    expected_dist += G[u][v]['weight']
+                    word += G[u][v]['label']
+                self.assertEqual(dist, expected_dist)
+                self.assertEqual(dist, dist2)
+                self.assertTrue(str2regexp(string).evalWordP(word))
+
+            except nx.NetworkXNoPath:
+                continue
+            break
+
+
+    def test_st_shortest_path__bidirectional(self):
+        while True:
+            sigma = ['a', 'b', 'c', 'd', 'e']
+            (G, dic) = GraphGenerator.random_weighted_labeled_grid(15, 15, 50, sigma)
+            (G, dic) = GraphHelper.convert_node_labels_to_integers(G, dic)
+            string = 'a*((b+cd)*+e)'
+
+            try:
+                source = random.choice(G.nodes())
+                target = random.choice(G.nodes())
+
+                (dist, path) = REGLanguage.st_reg_shortest_path__bidirectional(G, source, target, string)
+                (dist2, path2) = REGLanguage.st_reg_shortest_path(G, source, target, string)
+
+                self.assertEqual(path[0], source)
+                self.assertEqual(path[-1], target)
+
+                expected_dist = 0
+                word = []
+                for u, v in zip(path[:-1], path[1:]):
+                    self.assertTrue(G.has_edge(u, v))
+                    expected_dist += G[u][v]['weight']
+                    word += G[u][v]['label']
+                self.assertEqual(dist, expected_dist)
+                self.assertEqual(dist, dist2)
+                self.assertTrue(str2regexp(string).evalWordP(word))
+
+            except nx.NetworkXNoPath:
+                continue
+            break
+
+
+    def test_st_shortest_path__astar(self):
+        while True:
+            sigma = ['a', 'b']
+            (G, dic) = GraphGenerator.random_weighted_labeled_grid(15, 15, 50, sigma)
+            scale = GraphHelper.get_min_weight_per_distance(G, dic)
+            string = "(b+bab)*+a*"
+
+            try:
+                source = random.choice(G.nodes())
+                target = random.choice(G.nodes())
+                heuristic = GraphHelper.get_euclidean_heuristic(dic, target, scale)
+
+                (dist, path) = REGLanguage.st_reg_shortest_path__astar(G, source, target, string, heuristic)
+                (dist2, path2) = REGLanguage.st_reg_shortest_path(G, source, target, string)
+
+                self.assertEqual(path[0], source)
+                self.assertEqual(path[-1], target)
+
+                expected_dist = 0
+                word = []
+                for u, v in zip(path[:-1], path[1:]):
+                    self.assertTrue(G.has_edge(u, v))
+                    expected_dist += G[u][v]['weight']
+                    word += G[u][v]['label']
+                self.assertEqual(dist, expected_dist)
+                self.assertEqual(dist, dist2)
+                self.assertTrue(str2regexp(string).evalWordP(word))
+
+            except nx.NetworkXNoPath:
+                continue
+            break
+
+
+    def test_st_shortest_path__spg(self):
+        G = GraphGenerator.random_weighted_spg(200, 50)
+        for u, v, key, data in G.edges(keys=True, data=True):
+            data['label'] = random.choice(['a', 'b'])
+        tree = GraphHelper.get_sp_tree(G)
+
+        for string in ["(a+b)*", "a*b(a+b)*", "(ab+b)*", "(a+b)*a(a+b)*a(a+b)*"]:
+            expected = None
+            try:
+                expected = REGLanguage.st_reg_shortest_path__dag(G, tree.source, tree.sink, string)
+            except nx.NetworkXNoPath:
+                pass
+
+            try:
+                (dist, path) = REGLanguage.st_reg_shortest_path__spg(G, tree.source, tree.sink, string)
+            except nx.NetworkXNoPath:
+                self.assertEqual(expected, None)
+                continue
+
+            self.assertEqual(dist, expected[0])
+            self.assertEqual(path[0], tree.source)
+            self.assertEqual(path[-1], tree.sink)
+
+            (MR, table) = Automaton.compile_regex(string)
+            dists = {MR.Initial: 0}
+            for u, v in zip(path[:-1], path[1:]):
+                self.assertTrue(G.has_edge(u, v))
+                new_dists = dict()
+                for data in G[u][v].values():
+                    for state in dists:
+                        successor = table.get(data['label'], [-1] * len(MR.States))[state]
+                        weight = dists[state] + data['weight']
+                        if successor != -1 and weight < new_dists.get(successor, float('inf')):
+                            new_dists[successor] = weight
+                dists = new_dists
+            self.assertEqual(min([dists[state] for state in dists if state in MR.Final]), dist)
+
+    def test_st_shortest_path__spg_simple_graph(self):
+        edges = [(0, 1), (1, 2), (2, 5), (1, 3), (3, 5), (1, 4), (4, 5), (5, 6), (6, 8), (5, 7), (7, 8), (5, 8),
+                 (0, 9), (9, 8)]
+        for i in range(20):
+            G = nx.DiGraph()
+            for u, v in edges:
+                G.add_edge(u, v, {'weight': random.randint(1, 50), 'label': random.choice(['a', 'b'])})
+
+            for string in ["a*b*", "(ab+b)*", "a*ba*", "(ab)*b*", "b*ab*ab*"]:
+                expected = None
+                try:
+                    expected = REGLanguage.st_reg_shortest_path(G, 0, 8, string)
+                except nx.NetworkXNoPath:
+                    pass
+
+                try:
+                    (dist, path) = REGLanguage.st_reg_shortest_path__spg(G, 0, 8, string)
+                except nx.NetworkXNoPath:
+                    self.assertEqual(expected, None)
+                    continue
+
+                self.assertEqual(dist, expected[0])
+                self.assertEqual(path[0], 0)
+                self.assertEqual(path[-1], 8)
+                weight = 0
+                for u, v in GraphHelper.get_edgelist_from_nodelist(path):
+                    weight += G[u][v]['weight']
+                self.assertEqual(weight, dist)
+
+    def test_st_shortest_path__spg_cached(self):
+        (G, tree) = GraphGenerator.random_weighted_spg__tree(100, 50)
+        for u, v, key, data in G.edges(keys=True, data=True):
+            data['label'] = random.choice(['a', 'b'])
+        GraphHelper.invalidate_label_index(G)
+        string = "a*b(a+b)*"
+
+        first = None
+        try:
+            first = REGLanguage.st_reg_shortest_path__spg(G, tree.source, tree.sink, string)
+        except nx.NetworkXNoPath:
+            pass
+        cache = GraphHelper.transfer_matrices[G][1]
+        self.assertEqual(cache.misses, 1)
+
+        second = None
+        try:
+            second = REGLanguage.st_reg_shortest_path__spg(G, tree.source, tree.sink, string)
+        except nx.NetworkXNoPath:
+            pass
+        self.assertEqual(second, first)
+        self.assertEqual(cache.hits, 1)
+
+        (u, v, key) = list(G.edges(keys=True))[0]
+        G[u][v][key]['label'] = 'c'
+        GraphHelper.invalidate_label_index(G)
+        self.assertFalse(G in GraphHelper.transfer_matrices)
+
+
+    def test_compare_algorithms__queues(self):
+        while True:
+            sigma = ['a', 'b']
+            (G, dic) = GraphGenerator.random_weighted_labeled_grid(15, 15, 50, sigma)
+            string = "(b+bab)*+a*"
+
+            try:
+                source = random.choice(G.nodes())
+                target = random.choice(G.nodes())
+
+                (dist, path) = REGLanguage.st_reg_shortest_path(G, source, target, string)
+                (dist2, path2) = REGLanguage.st_reg_shortest_path(G, source, target, string, queue=LazyHeap)
+                (dist3, path3) = REGLanguage.st_reg_shortest_path__bidirectional(G, source, target, string,
+                                                                                 queue=LazyHeap)
+                (dist4, path4) = REGLanguage.st_reg_shortest_path(G, source, target, string, queue=RadixHeap)
+
+                self.assertEqual(dist, dist2)
+                self.assertEqual(dist, dist3)
+                self.assertEqual(dist, dist4)
+
+            except nx.NetworkXNoPath:
+                continue
+            break
+
+
 class TestCFLanguage(unittest.TestCase):
 
     def test_initialize_matrix(self):
@@ -285,6 +549,267 @@ class TestCFLanguage(unittest.TestCase):
                     if D[u][v][A] < float('inf'):
                         self.assertTrue(nx.has_path(G, u, v))
 
+    def test_all_pair_shortest_path__worklist(self):
+        productions = [('S', ('S', 'S')), ('S', ('a', 'S', 'b')), ('S', ('c'))]
+        grammar = CNF(productions)
+
+        grammar.makenonterminals()
+        grammar.maketerminals()
+        terminals = grammar.Terminals
+        grammar.terminalrules()
+
+        (G, dic) = GraphGenerator.random_weighted_labeled_grid(3, 4, 50, list(terminals))
+
+        D = CFLanguage.all_pair_cfg_shortest_path(G, grammar)
+        D2 = CFLanguage.all_pair_cfg_shortest_path__worklist(G, grammar)
+
+        self.assertEqual(D, D2)
+
+    def test_all_pair_shortest_path__worklist_reg_grammar(self):
+        productions = [('S', ('a', 'S')), ('S', ('S', 'b')), ('S', common.Epsilon)]
+        grammar = CNF(productions)
+
+        grammar.makenonterminals()
+        grammar.maketerminals()
+        terminals = grammar.Terminals
+        grammar.terminalrules()
+
+        (G, dic) = GraphGenerator.random_weighted_labeled_grid(3, 4, 50, ['a', 'b'])
+
+        D = CFLanguage.all_pair_cfg_shortest_path(G, grammar)
+        D2 = CFLanguage.all_pair_cfg_shortest_path__worklist(G, grammar)
+
+        self.assertEqual(D, D2)
+        for v in D2:
+            self.assertEqual(D2[v][v][grammar.Start], 0)
+
+    def test_all_pair_shortest_path__worklist_large(self):
+        productions = [('S', ('a', 'S', 'b')), ('S', ('a', 'b'))]
+        grammar = CNF(productions)
+
+        grammar.makenonterminals()
+        grammar.maketerminals()
+        grammar.terminalrules()
+
+        (G, dic) = GraphGenerator.random_weighted_labeled_grid(10, 10, 50, ['a', 'b'])
+
+        D = CFLanguage.all_pair_cfg_shortest_path__worklist(G, grammar)
+
+        for u in D:
+            for v in D[u]:
+                if D[u][v][grammar.Start] < float('inf'):
+                    self.assertTrue(nx.has_path(G, u, v))
+                    self.assertTrue(D[u][v][grammar.Start] >= nx.shortest_path_length(G, u, v, weight='weight'))
+
+    def test_all_pair_shortest_path__matrix(self):
+        for productions in [[('S', ('S', 'S')), ('S', ('a', 'S', 'b')), ('S', ('c'))],
+                            [('S', ('a', 'S')), ('S', ('S', 'b')), ('S', common.Epsilon)]]:
+            grammar = CNF(productions)
+
+            grammar.makenonterminals()
+            grammar.maketerminals()
+            grammar.terminalrules()
+
+            (G, dic) = GraphGenerator.random_weighted_labeled_grid(6, 6, 50, ['a', 'b', 'c'])
+
+            D = CFLanguage.all_pair_cfg_shortest_path__worklist(G, grammar)
+            (nodes, M) = CFLanguage.all_pair_cfg_shortest_path__matrix(G, grammar)
+
+            self.assertEqual(set(M.keys()), set(grammar.Nonterminals))
+            for i, u in enumerate(nodes):
+                for j, v in enumerate(nodes):
+                    for A in M:
+                        self.assertEqual(M[A][i, j], D[u][v][A])
+
+    def test_all_pair_shortest_path__worklist_sparse(self):
+        productions = [('S', ('S', 'S')), ('S', ('a', 'S', 'b')), ('S', ('c'))]
+        grammar = CNF(productions)
+
+        grammar.makenonterminals()
+        grammar.maketerminals()
+        grammar.terminalrules()
+
+        (G, dic) = GraphGenerator.random_weighted_labeled_grid(6, 6, 50, ['a', 'b', 'c'])
+
+        D = CFLanguage.all_pair_cfg_shortest_path__worklist(G, grammar)
+        table = CFLanguage.all_pair_cfg_shortest_path__worklist(G, grammar, dense=False)
+
+        self.assertTrue(isinstance(table, CFLTable))
+        self.assertEqual(table.to_dict(G.nodes(), grammar.Nonterminals), D)
+        for u in D:
+            for v in D[u]:
+                for A in D[u][v]:
+                    self.assertEqual(table.get(u, A, v), D[u][v][A])
+                    self.assertEqual(table.contains(u, A, v), D[u][v][A] < float('inf'))
+
+    def test_all_pair_shortest_path__parallel(self):
+        productions = [('S', ('S', 'S')), ('S', ('a', 'S', 'b')), ('S', ('c'))]
+        grammar = CNF(productions)
+
+        grammar.makenonterminals()
+        grammar.maketerminals()
+        grammar.terminalrules()
+
+        (G, dic) = GraphGenerator.random_weighted_labeled_grid(6, 6, 50, ['a', 'b', 'c'])
+
+        (nodes, M) = CFLanguage.all_pair_cfg_shortest_path__matrix(G, grammar)
+        for processes in [1, 2, 4]:
+            (nodes2, M2) = CFLanguage.all_pair_cfg_shortest_path__parallel(G, grammar, processes, blocks=5)
+
+            self.assertEqual(nodes2, nodes)
+            self.assertEqual(set(M2.keys()), set(M.keys()))
+            for A in M:
+                self.assertTrue(np.array_equal(M2[A], M[A]))
+        self.assertEqual(constrainedpath._cfl_worker, dict())
+
+    def test_all_pair_shortest_path__worklist_paths(self):
+        productions = [('S', ('S', 'S')), ('S', ('a', 'S', 'b')), ('S', ('c'))]
+        grammar = CNF(productions)
+
+        grammar.makenonterminals()
+        grammar.maketerminals()
+        grammar.terminalrules()
+
+        (G, dic) = GraphGenerator.random_weighted_labeled_grid(5, 5, 50, ['a', 'b', 'c'])
+
+        D = CFLanguage.all_pair_cfg_shortest_path__worklist(G, grammar)
+        (D2, pred) = CFLanguage.all_pair_cfg_shortest_path__worklist(G, grammar, paths=True)
+
+        compiled = GrammarHelper.get_compiled_grammar(grammar)
+
+        self.assertEqual(D, D2)
+        for u in D:
+            for v in D[u]:
+                if D[u][v][grammar.Start] < float('inf'):
+                    path = CFLanguage.get_path(pred, (u, compiled.start, v), compiled)
+
+                    self.assertEqual(path[0], u)
+                    self.assertEqual(path[-1], v)
+                    weight = 0
+                    word = ''
+                    for x, y in GraphHelper.get_edgelist_from_nodelist(path):
+                        weight += G[x][y]['weight']
+                        word += G[x][y]['label']
+                    self.assertEqual(weight, D[u][v][grammar.Start])
+                    self.assertEqual(word.count('a'), word.count('b'))
+
+    def test_get_path__deep_derivation(self):
+        productions = [('S', ('a', 'S', 'b')), ('S', ('c'))]
+        grammar = CNF(productions)
+
+        grammar.makenonterminals()
+        grammar.maketerminals()
+        grammar.terminalrules()
+
+        n = 1500
+        G = nx.DiGraph()
+        labels = ['a'] * n + ['c'] + ['b'] * n
+        for i, label in enumerate(labels):
+            G.add_edge(i, i + 1, {'weight': 1, 'label': label})
+
+        (dist, path) = CFLanguage.st_cfg_shortest_path(G, 0, 2 * n + 1, grammar)
+
+        self.assertEqual(dist, 2 * n + 1)
+        self.assertEqual(path, list(range(2 * n + 2)))
+
+    def test_st_cfg_shortest_path(self):
+        for productions in [[('S', ('S', 'S')), ('S', ('a', 'S', 'b')), ('S', ('c'))],
+                            [('S', ('a', 'S')), ('S', ('S', 'b')), ('S', common.Epsilon)]]:
+            grammar = CNF(productions)
+
+            grammar.makenonterminals()
+            grammar.maketerminals()
+            grammar.terminalrules()
+
+            (G, dic) = GraphGenerator.random_weighted_labeled_grid(5, 5, 50, ['a', 'b', 'c'])
+            nodes = G.nodes()
+
+            D = CFLanguage.all_pair_cfg_shortest_path__worklist(G, grammar)
+
+            for i in range(20):
+                source = random.choice(nodes)
+                target = random.choice(nodes)
+
+                dist = float('inf')
+                try:
+                    (dist, path) = CFLanguage.st_cfg_shortest_path(G, source, target, grammar)
+
+                    self.assertEqual(path[0], source)
+                    self.assertEqual(path[-1], target)
+                    weight = 0
+                    for u, v in GraphHelper.get_edgelist_from_nodelist(path):
+                        weight += G[u][v]['weight']
+                    self.assertEqual(weight, dist)
+                except nx.NetworkXNoPath:
+                    pass
+
+                self.assertEqual(dist, D[source][target][grammar.Start])
+
+    def test_st_cfg_shortest_path__multigraph(self):
+        productions = [('S', ('S', 'S')), ('S', ('a', 'S', 'b')), ('S', ('c'))]
+        grammar = CNF(productions)
+
+        grammar.makenonterminals()
+        grammar.maketerminals()
+        grammar.terminalrules()
+
+        (G, dic) = GraphGenerator.random_weighted_labeled_grid(4, 4, 50, ['a', 'b', 'c'])
+        G = nx.MultiDiGraph(G)
+        for u, v in list(G.edges()):
+            G.add_edge(u, v, weight=random.randint(1, 50), label=random.choice(['a', 'b', 'c']))
+        nodes = G.nodes()
+
+        D = CFLanguage.all_pair_cfg_shortest_path__worklist(G, grammar)
+
+        for source in nodes:
+            for target in nodes:
+                dist = float('inf')
+                try:
+                    (dist, path) = CFLanguage.st_cfg_shortest_path(G, source, target, grammar)
+
+                    self.assertEqual(path[0], source)
+                    self.assertEqual(path[-1], target)
+                except nx.NetworkXNoPath:
+                    pass
+
+                self.assertEqual(dist, D[source][target][grammar.Start])
+
+
+class TestCFLTable(unittest.TestCase):
+
+    def test_init(self):
+        table = CFLTable()
+
+        self.assertEqual(table.size, 0)
+        self.assertEqual(list(table.facts()), [])
+
+    def test_add(self):
+        table = CFLTable()
+        table.add(1, 'S', 2, 10)
+        table.add(1, 'S', 3, 5)
+        table.add(4, 'S', 3, 7)
+        table.add(1, 'S', 2, 8)
+
+        self.assertEqual(table.size, 3)
+        self.assertEqual(table.get(1, 'S', 2), 8)
+        self.assertEqual(table.get(2, 'S', 1), float('inf'))
+        self.assertTrue(table.contains(4, 'S', 3))
+        self.assertFalse(table.contains(4, 'A', 3))
+        self.assertEqual(table.successors(1, 'S'), {2: 8, 3: 5})
+        self.assertEqual(table.predecessors('S', 3), {1: 5, 4: 7})
+        self.assertEqual(table.successors(2, 'S'), {})
+        self.assertEqual(set(table.facts()), {(1, 'S', 2, 8), (1, 'S', 3, 5), (4, 'S', 3, 7)})
+
+    def test_to_dict(self):
+        table = CFLTable()
+        table.add(1, 'S', 2, 10)
+
+        D = table.to_dict([1, 2], {'S', 'A'})
+
+        self.assertEqual(D[1][2]['S'], 10)
+        self.assertEqual(D[1][2]['A'], float('inf'))
+        self.assertEqual(D[2][1]['S'], float('inf'))
+
 
 class TestKSimilarPath(unittest.TestCase):
 
@@ -330,4 +855,90 @@ class TestKSimilarPath(unittest.TestCase):
         self.assertTrue(taken_edges <= k)
         self.assertEqual(taken_edges, common_edges)
 
+    def test_st_k_similar_path__layered(self):
+        G = GraphGenerator.random_weighted_graph(100, 0.03, 50)
+        G = GraphGenerator.random_label(G, ['a', 'b'])
+        nodes = nx.nodes(G)
+        labels = dict(((u, v), data['label']) for u, v, data in G.edges(data=True))
+
+        for i in range(10):
+            source = random.choice(nodes)
+            target = random.choice(nodes)
+            k = random.randint(0, 6)
+
+            result = None
+            try:
+                result = KSimilarPath.st_k_similar_path__layered(G, source, target, k)
+            except nx.NetworkXNoPath:
+                pass
+
+            for u, v, data in G.edges(data=True):
+                self.assertEqual(data['label'], labels[(u, v)])
+
+            H = G.copy()
+            expected = None
+            try:
+                expected = KSimilarPath.st_k_similar_path(H, source, target, k)
+            except nx.NetworkXNoPath:
+                pass
+
+            if expected is None:
+                self.assertEqual(result, None)
+                continue
+
+            (dist, distk, path, pathk) = result
+            self.assertEqual(dist, expected[0])
+            self.assertEqual(distk, expected[1])
+            self.assertEqual(pathk[0], source)
+            self.assertEqual(pathk[-1], target)
+
+            pathlist = GraphHelper.get_edgelist_from_nodelist(path)
+            weight = 0
+            common_edges = 0
+            for edge in GraphHelper.get_edgelist_from_nodelist(pathk):
+                weight += G[edge[0]][edge[1]]['weight']
+                if edge in pathlist:
+                    common_edges += 1
+            self.assertEqual(weight, distk)
+            self.assertTrue(common_edges <= k)
+
+    def test_st_k_similar_path__sweep(self):
+        G = GraphGenerator.random_weighted_graph(100, 0.03, 50)
+        nodes = nx.nodes(G)
+        k_max = 6
+
+        for i in range(10):
+            source = random.choice(nodes)
+            target = random.choice(nodes)
+
+            try:
+                (dist, path, distsk, pathsk) = KSimilarPath.st_k_similar_path__sweep(G, source, target, k_max,
+                                                                                     paths=True)
+            except nx.NetworkXNoPath:
+                self.assertFalse(nx.has_path(G, source, target))
+                continue
 
+            self.assertEqual(len(distsk), k_max + 1)
+            self.assertEqual(len(pathsk), k_max + 1)
+            pathlist = GraphHelper.get_edgelist_from_nodelist(path)
+
+            for k in range(k_max + 1):
+                if k > 0:
+                    self.assertTrue(distsk[k] <= distsk[k - 1])
+                try:
+                    expected = KSimilarPath.st_k_similar_path__layered(G, source, target, k)[1]
+                except nx.NetworkXNoPath:
+                    expected = float('inf')
+                self.assertEqual(distsk[k], expected)
+
+                if pathsk[k] is None:
+                    self.assertEqual(distsk[k], float('inf'))
+                    continue
+                weight = 0
+                common_edges = 0
+                for edge in GraphHelper.get_edgelist_from_nodelist(pathsk[k]):
+                    weight += G[edge[0]][edge[1]]['weight']
+                    if edge in pathlist:
+                        common_edges += 1
+                self.assertEqual(weight, distsk[k])
+                self.assertTrue(common_edges <= k)
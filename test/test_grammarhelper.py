@@ -1,6 +1,6 @@
 import unittest
 from FAdo.cfg import *
-from grammarhelper import GrammarHelper
+from grammarhelper import GrammarHelper, CompiledGrammar
 
 
 class GrammarHelperTest(unittest.TestCase):
@@ -104,4 +104,145 @@ class GrammarHelperTest(unittest.TestCase):
                 self.assertTrue(derivative in nonterminals or derivative in terminals)
             elif isinstance(derivative, tuple):
                 for symbol in derivative:
-                    self.assertTrue(symbol in nonterminals or symbol in terminals)
\ No newline at end of file
+                    self.assertTrue(symbol in nonterminals or symbol in terminals)
+
+    def test_is_derivable_cyk(self):
+        productions = [('S', ('S', 'S')), ('S', ('a', 'S', 'b')), ('S', ('c'))]
+        G = CNF(productions)
+
+        self.assertTrue(GrammarHelper.is_derivable_cyk(G, 'c'))
+        self.assertTrue(GrammarHelper.is_derivable_cyk(G, ('a', 'c', 'b')))
+        self.assertTrue(GrammarHelper.is_derivable_cyk(G, ('a', 'c', 'b', 'a', 'c', 'b')))
+        self.assertFalse(GrammarHelper.is_derivable_cyk(G, ('a', 'b')))
+        self.assertFalse(GrammarHelper.is_derivable_cyk(G, ('a', 'a', 'b')))
+        self.assertFalse(GrammarHelper.is_derivable_cyk(G, ()))
+
+        word = ('a',) * 100 + ('c',) + ('b',) * 100
+        self.assertTrue(GrammarHelper.is_derivable_cyk(G, word))
+        self.assertFalse(GrammarHelper.is_derivable_cyk(G, word[1:]))
+
+    def test_is_derivable_cyk__epsilon(self):
+        productions = [('S', ('a', 'S')), ('S', ('S', 'b')), ('S', common.Epsilon)]
+        G = CNF(productions)
+
+        self.assertTrue(GrammarHelper.is_derivable_cyk(G, ()))
+        self.assertTrue(GrammarHelper.is_derivable_cyk(G, 'a'))
+        self.assertTrue(GrammarHelper.is_derivable_cyk(G, ('a', 'a', 'b')))
+        self.assertFalse(GrammarHelper.is_derivable_cyk(G, ('b', 'a')))
+
+    def test_is_derivable_earley(self):
+        productions = [('S', ('A')), ('A', ('x', 'A', 'y')), ('A', ('x', 'B', 'y')), ('B', ('z'))]
+        G = CFGrammar(productions)
+
+        self.assertTrue(GrammarHelper.is_derivable_earley(G, ('x', 'z', 'y')))
+        self.assertTrue(GrammarHelper.is_derivable_earley(G, ('x', 'x', 'x', 'z', 'y', 'y', 'y')))
+        self.assertFalse(GrammarHelper.is_derivable_earley(G, ('x', 'x', 'z', 'y')))
+        self.assertFalse(GrammarHelper.is_derivable_earley(G, ('x', 'y')))
+        self.assertFalse(GrammarHelper.is_derivable_earley(G, 'z'))
+
+        word = ('x',) * 100 + ('z',) + ('y',) * 100
+        self.assertTrue(GrammarHelper.is_derivable_earley(G, word))
+        self.assertFalse(GrammarHelper.is_derivable_earley(G, word[:-1]))
+
+    def test_is_derivable_earley__epsilon(self):
+        productions = [('S', ('A', 'B')), ('A', ('a', 'A')), ('A', common.Epsilon),
+                       ('B', ('b', 'B')), ('B', common.Epsilon)]
+        G = CFGrammar(productions)
+
+        self.assertTrue(GrammarHelper.is_derivable_earley(G, ()))
+        self.assertTrue(GrammarHelper.is_derivable_earley(G, ('a', 'a', 'b')))
+        self.assertTrue(GrammarHelper.is_derivable_earley(G, ('b', 'b')))
+        self.assertFalse(GrammarHelper.is_derivable_earley(G, ('b', 'a')))
+
+    def test_get_reverse_rules(self):
+        productions = [('S', ('S', 'S')), ('S', ('a', 'S', 'b')), ('S', ('c'))]
+        G = CNF(productions)
+
+        reverse = GrammarHelper.get_reverse_rules(G)
+
+        self.assertEqual(reverse[('S', 'S')], {'S'})
+        self.assertEqual(reverse['c'], {'S'})
+        self.assertEqual(reverse['a'], {'A@a'})
+        for body in reverse:
+            for head in reverse[body]:
+                self.assertTrue((head, body) in G.Rules)
+
+    def test_get_compiled_grammar(self):
+        productions = [('S', ('S', 'S')), ('S', ('a', 'S', 'b')), ('S', ('c'))]
+        G = CNF(productions)
+
+        compiled = GrammarHelper.get_compiled_grammar(G)
+
+        self.assertTrue(compiled is GrammarHelper.get_compiled_grammar(G))
+        self.assertTrue(compiled.is_current(G))
+
+        G.Rules.append(('S', 'd'))
+        compiled2 = GrammarHelper.get_compiled_grammar(G)
+
+        self.assertFalse(compiled is compiled2)
+        self.assertEqual(list(compiled2.terminal_heads['d']), [compiled2.index['S']])
+
+    def test_get_compiled_grammar__replaced_rule(self):
+        productions = [('S', ('S', 'S')), ('S', ('a', 'S', 'b')), ('S', ('c'))]
+        G = CNF(productions)
+        compiled = GrammarHelper.get_compiled_grammar(G)
+
+        i = G.Rules.index(('S', 'c'))
+        G.Rules[i] = ('S', 'd')
+        compiled2 = GrammarHelper.get_compiled_grammar(G)
+
+        self.assertFalse(compiled is compiled2)
+        self.assertFalse('c' in compiled2.terminal_heads)
+        self.assertEqual(list(compiled2.terminal_heads['d']), [compiled2.index['S']])
+
+    def test_get_rule_index(self):
+        productions = [('S', ('S', 'S')), ('S', ('a', 'S', 'b')), ('S', ('c'))]
+        G = CNF(productions)
+
+        index = GrammarHelper.get_rule_index(G)
+        self.assertTrue(GrammarHelper.is_derivable_cyk(G, ('a', 'c', 'b')))
+
+        self.assertTrue(index is GrammarHelper.get_rule_index(G))
+        self.assertEqual(index.reverse, GrammarHelper.get_reverse_rules(G))
+
+        i = G.Rules.index(('S', 'c'))
+        G.Rules[i] = ('S', 'd')
+        index2 = GrammarHelper.get_rule_index(G)
+
+        self.assertFalse(index is index2)
+        self.assertFalse(GrammarHelper.is_derivable_cyk(G, ('a', 'c', 'b')))
+        self.assertTrue(GrammarHelper.is_derivable_cyk(G, ('a', 'd', 'b')))
+
+
+class TestCompiledGrammar(unittest.TestCase):
+
+    def test_init(self):
+        productions = [('S', ('S', 'S')), ('S', ('a', 'S', 'b')), ('S', ('c'))]
+        G = CNF(productions)
+
+        compiled = CompiledGrammar(G)
+        index = compiled.index
+
+        self.assertEqual(set(compiled.nonterminals), {'S', 'A@_0', 'A@a', 'A@b'})
+        self.assertEqual(compiled.start, index['S'])
+        self.assertEqual(list(compiled.terminal_heads['c']), [index['S']])
+        self.assertEqual(list(compiled.terminal_heads['a']), [index['A@a']])
+        self.assertEqual(list(compiled.binary_heads[(index['S'], index['S'])]), [index['S']])
+        self.assertEqual(list(compiled.epsilon_heads), [])
+
+        for i, (A, body) in enumerate(compiled.rules):
+            (head, original) = G.Rules[i]
+            self.assertEqual(compiled.nonterminals[A], head)
+            if isinstance(body, tuple):
+                self.assertEqual(tuple([compiled.nonterminals[B] for B in body]), original)
+                self.assertTrue((A, body[1], i) in compiled.left_rules[body[0]])
+                self.assertTrue((A, body[0], i) in compiled.right_rules[body[1]])
+                self.assertTrue((body[0], body[1], i) in compiled.head_rules[A])
+
+    def test_init__epsilon(self):
+        productions = [('S', ('a', 'S')), ('S', ('S', 'b')), ('S', common.Epsilon)]
+        G = CNF(productions)
+
+        compiled = CompiledGrammar(G)
+
+        self.assertEqual(list(compiled.epsilon_heads), [compiled.index['S']])
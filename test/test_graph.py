@@ -3,7 +3,7 @@ import numpy as np
 import unittest
 import random
 import math
-from graph import GraphGenerator, GraphHelper
+from graph import GraphGenerator, GraphHelper, LabelIndex, SPTree
 
 
 class TestGraphGenerator(unittest.TestCase):
@@ -50,6 +50,34 @@ class TestGraphGenerator(unittest.TestCase):
             self.assertTrue(isinstance(d['weight'], int))
             self.assertTrue(d['weight'] <= 50)
 
+    def test_random_weighted_spg__tree(self):
+        (G, tree) = GraphGenerator.random_weighted_spg__tree(100, 50)
+
+        self.assertEqual(G.number_of_edges(), 100)
+        self.assertTrue(nx.is_directed_acyclic_graph(G))
+        self.assertTrue(GraphHelper.get_sp_tree(G) is tree)
+
+        for u, v, d in G.edges(data=True):
+            self.assertTrue(isinstance(d['weight'], int))
+            self.assertTrue(1 <= d['weight'] <= 50)
+
+        self.assertEqual([node for node in G.nodes() if G.in_degree(node) == 0], [tree.source])
+        self.assertEqual([node for node in G.nodes() if G.out_degree(node) == 0], [tree.sink])
+        self.assertEqual(tree.ends[tree.root], (tree.source, tree.sink))
+
+        leaves = [tree.edge[current] for current in tree.order if tree.kind[current] == 'edge']
+        self.assertEqual(sorted(leaves), sorted(G.edges(keys=True)))
+        for current in tree.order:
+            children = tree.children[current]
+            if tree.kind[current] == 'series':
+                self.assertEqual(tree.ends[children[0]][0], tree.ends[current][0])
+                self.assertEqual(tree.ends[children[-1]][1], tree.ends[current][1])
+                for first, second in zip(children[:-1], children[1:]):
+                    self.assertEqual(tree.ends[first][1], tree.ends[second][0])
+            elif tree.kind[current] == 'parallel':
+                for child in children:
+                    self.assertEqual(tree.ends[child], tree.ends[current])
+
     def test_random_weighted_grid(self):
         sigma = ['a','b']
         (G, dic) = GraphGenerator.random_weighted_labeled_grid(50, 50, 50, sigma)
@@ -200,6 +228,27 @@ class TestGraphHelper(unittest.TestCase):
             self.assertTrue(d['weight'] >= geometric_dist)
             self.assertTrue(d['weight'] <= geometric_dist + 1)
 
+    def test_get_min_weight_per_distance(self):
+        sigma = ['a', 'b']
+        (G, dic) = GraphGenerator.random_weighted_labeled_grid(20, 20, 50, sigma)
+
+        scale = GraphHelper.get_min_weight_per_distance(G, dic)
+
+        self.assertEqual(scale, min([d['weight'] for u, v, d in G.edges(data=True)]))
+
+    def test_get_euclidean_heuristic(self):
+        sigma = ['a', 'b']
+        (G, dic) = GraphGenerator.random_weighted_labeled_grid(20, 20, 50, sigma)
+        scale = GraphHelper.get_min_weight_per_distance(G, dic)
+        target = random.choice(G.nodes())
+
+        heuristic = GraphHelper.get_euclidean_heuristic(dic, target, scale)
+        expected_dist = nx.shortest_path_length(G, target=target, weight="weight")
+
+        self.assertEqual(heuristic(target), 0)
+        for node in expected_dist:
+            self.assertTrue(heuristic(node) <= expected_dist[node])
+
     def test_merge_nodes(self):
         G1 = nx.Graph()
         G1.add_edge(1, 2)
@@ -344,4 +393,178 @@ class TestGraphHelper(unittest.TestCase):
             self.assertFalse('old' in data)
 
         for node, data in G_old.nodes(data=True):
-            self.assertTrue(dic_old[node] in dic.values())
\ No newline at end of file
+            self.assertTrue(dic_old[node] in dic.values())
+
+    def test_get_label_index(self):
+        G = GraphGenerator.random_weighted_graph(50, 0.1, 50)
+        G = GraphGenerator.random_label(G, ['a', 'b'])
+
+        index = GraphHelper.get_label_index(G)
+
+        self.assertTrue(GraphHelper.get_label_index(G) is index)
+        for u, v, d in G.edges(data=True):
+            self.assertTrue(v in index.successors[u][d['label']])
+
+    def test_get_label_index__changed_graph(self):
+        G = GraphGenerator.random_weighted_graph(50, 0.1, 50)
+        G = GraphGenerator.random_label(G, ['a', 'b'])
+        index = GraphHelper.get_label_index(G)
+
+        G.add_edge(100, 101, {'weight': 1, 'label': 'c'})
+        new_index = GraphHelper.get_label_index(G)
+
+        self.assertFalse(new_index is index)
+        self.assertEqual(new_index.successors[100], {'c': {101}})
+        self.assertEqual(new_index.successors[101], {})
+
+    def test_get_label_index__replaced_edge(self):
+        G = nx.DiGraph()
+        G.add_edge(1, 2, {'weight': 1, 'label': 'a'})
+        G.add_edge(2, 3, {'weight': 1, 'label': 'a'})
+        index = GraphHelper.get_label_index(G)
+
+        G.remove_edge(1, 2)
+        G.add_edge(2, 1, {'weight': 1, 'label': 'a'})
+        new_index = GraphHelper.get_label_index(G)
+
+        self.assertFalse(new_index is index)
+        self.assertEqual(new_index.successors[1], {})
+        self.assertEqual(new_index.successors[2], {'a': {1, 3}})
+
+    def test_get_label_index__direct_label(self):
+        G = GraphGenerator.random_weighted_graph(50, 0.1, 50)
+        G = GraphGenerator.random_label(G, ['a', 'b'])
+        index = GraphHelper.get_label_index(G)
+
+        (u, v) = random.choice(G.edges())
+        G[u][v]['label'] = 'c'
+        new_index = GraphHelper.get_label_index(G)
+
+        self.assertFalse(new_index is index)
+        self.assertTrue(v in new_index.successors[u]['c'])
+        for label in ['a', 'b']:
+            self.assertFalse(v in new_index.successors[u].get(label, set()))
+
+    def test_get_label_index__copy(self):
+        G = GraphGenerator.random_weighted_graph(50, 0.1, 50)
+        G = GraphGenerator.random_label(G, ['a', 'b'])
+        index = GraphHelper.get_label_index(G)
+
+        H = G.reverse(copy=True)
+
+        self.assertEqual(H.graph, G.graph)
+        self.assertFalse(GraphHelper.get_label_index(H) is index)
+        self.assertTrue(GraphHelper.get_label_index(G) is index)
+
+    def test_get_label_index__random_label(self):
+        G = GraphGenerator.random_weighted_graph(50, 0.1, 50)
+        G = GraphGenerator.random_label(G, ['a', 'b'])
+        index = GraphHelper.get_label_index(G)
+
+        G = GraphGenerator.random_label(G, ['c', 'd'])
+        new_index = GraphHelper.get_label_index(G)
+
+        self.assertFalse(new_index is index)
+        for u, v, d in G.edges(data=True):
+            self.assertTrue(v in new_index.successors[u][d['label']])
+
+    def test_set_label(self):
+        G = GraphGenerator.random_weighted_graph(50, 0.1, 50)
+        G = GraphGenerator.random_label(G, ['a', 'b'])
+        index = GraphHelper.get_label_index(G)
+
+        for u, v in G.edges():
+            GraphHelper.set_label(G, u, v, 'c')
+
+        self.assertTrue(GraphHelper.get_label_index(G) is index)
+        for u in index.successors:
+            for label in index.successors[u]:
+                self.assertEqual(label, 'c')
+        for u, v in G.edges():
+            self.assertEqual(G[u][v]['label'], 'c')
+            self.assertTrue(v in index.successors[u]['c'])
+
+    def test_get_sp_tree(self):
+        G = GraphGenerator.random_weighted_spg(100, 50)
+        number_of_edges = G.number_of_edges()
+
+        tree = GraphHelper.get_sp_tree(G)
+
+        self.assertTrue(GraphHelper.get_sp_tree(G) is tree)
+        self.assertEqual(G.number_of_edges(), number_of_edges)
+        self.assertEqual(G.in_degree(tree.source), 0)
+        self.assertEqual(G.out_degree(tree.sink), 0)
+        self.assertEqual(tree.ends[tree.root], (tree.source, tree.sink))
+
+
+class TestLabelIndex(unittest.TestCase):
+
+    def test_init(self):
+        G = nx.DiGraph()
+        G.add_edge(1, 2, {'weight': 1, 'label': 'a'})
+        G.add_edge(1, 3, {'weight': 1, 'label': 'a'})
+        G.add_edge(2, 3, {'weight': 1, 'label': 'b'})
+
+        index = LabelIndex(G)
+
+        self.assertEqual(index.successors, {1: {'a': {2, 3}}, 2: {'b': {3}}, 3: {}})
+        self.assertEqual(index.predecessors, {1: {}, 2: {'a': {1}}, 3: {'a': {1}, 'b': {2}}})
+        self.assertTrue(index.is_current(G))
+        self.assertFalse(index.is_current(G.copy()))
+
+    def test_relabel_edge(self):
+        G = nx.DiGraph()
+        G.add_edge(1, 2, {'weight': 1, 'label': 'a'})
+        G.add_edge(1, 3, {'weight': 1, 'label': 'a'})
+
+        index = LabelIndex(G)
+        index.relabel_edge(1, 2, 'a', 'b')
+        index.relabel_edge(1, 3, 'a', 'b')
+
+        self.assertEqual(index.successors[1], {'b': {2, 3}})
+        self.assertEqual(index.predecessors[2], {'b': {1}})
+        self.assertEqual(index.predecessors[3], {'b': {1}})
+
+
+class TestSPTree(unittest.TestCase):
+
+    def test_init(self):
+        G = nx.MultiDiGraph()
+        G.add_edge(1, 2, weight=1)
+        G.add_edge(1, 2, weight=2)
+        G.add_edge(2, 3, weight=1)
+        G.add_edge(1, 3, weight=5)
+
+        tree = SPTree(G)
+
+        self.assertEqual((tree.source, tree.sink), (1, 3))
+        self.assertEqual(tree.kind[tree.root], 'parallel')
+        self.assertEqual(len(tree.children[tree.root]), 2)
+        kinds = sorted([tree.kind[child] for child in tree.children[tree.root]])
+        self.assertEqual(kinds, ['edge', 'series'])
+        self.assertEqual(len([current for current in tree.order if tree.kind[current] == 'edge']), 4)
+        self.assertEqual(tree.order[-1], tree.root)
+        self.assertTrue(tree.is_current(G))
+        self.assertFalse(tree.is_current(G.copy()))
+
+    def test_get_sp_tree__replaced_edge(self):
+        G = nx.MultiDiGraph()
+        G.add_edge(1, 2, weight=1)
+        G.add_edge(2, 3, weight=1)
+        G.add_edge(1, 3, weight=5)
+        tree = GraphHelper.get_sp_tree(G)
+
+        G.remove_edge(1, 3)
+        G.add_edge(1, 2, weight=2)
+        new_tree = GraphHelper.get_sp_tree(G)
+
+        self.assertFalse(new_tree is tree)
+        self.assertEqual(new_tree.kind[new_tree.root], 'series')
+        self.assertFalse(GraphHelper.get_sp_tree(G.copy()) is new_tree)
+        self.assertEqual(G.graph, {})
+
+    def test_init__not_sp(self):
+        G = nx.DiGraph()
+        G.add_edges_from([(0, 1), (0, 2), (1, 2), (1, 3), (2, 3)])
+
+        self.assertRaises(ValueError, SPTree, G)
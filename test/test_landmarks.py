@@ -0,0 +1,143 @@
+import unittest
+import os
+import random
+import tempfile
+import networkx as nx
+from graph import GraphGenerator, GraphHelper
+from landmarks import Landmarks
+from shortestpath import Dijkstra
+from constrainedpath import REGLanguage
+from FAdo.reex import *
+
+
+class TestLandmarks(unittest.TestCase):
+
+    def test_preprocess(self):
+        G = GraphGenerator.random_weighted_graph(100, 0.05, 50)
+
+        landmarks = Landmarks.preprocess(G, 4)
+
+        self.assertEqual(len(landmarks.landmarks), 4)
+        self.assertEqual(len(set(landmarks.landmarks)), 4)
+        for i, landmark in enumerate(landmarks.landmarks):
+            expected_forward = nx.shortest_path_length(G, source=landmark, weight="weight")
+            expected_backward = nx.shortest_path_length(G, target=landmark, weight="weight")
+            for j, node in enumerate(landmarks.nodes):
+                self.assertEqual(landmarks.forward[i][j], expected_forward.get(node, float('inf')))
+                self.assertEqual(landmarks.backward[i][j], expected_backward.get(node, float('inf')))
+
+    def test_preprocess__avoid(self):
+        (G, dic) = GraphGenerator.random_weighted_labeled_grid(15, 15, 50)
+
+        landmarks = Landmarks.preprocess(G, 4, method='avoid')
+
+        self.assertEqual(len(landmarks.landmarks), 4)
+        self.assertEqual(len(set(landmarks.landmarks)), 4)
+
+    def test_get_heuristic(self):
+        G = GraphGenerator.random_weighted_graph(100, 0.05, 50)
+        landmarks = Landmarks.preprocess(G, 3, method='avoid')
+        target = random.choice(G.nodes())
+
+        heuristic = landmarks.get_heuristic(target)
+        expected_dist = nx.shortest_path_length(G, target=target, weight="weight")
+
+        self.assertEqual(heuristic(target), 0)
+        for node in expected_dist:
+            self.assertTrue(heuristic(node) <= expected_dist[node])
+
+    def test_get_heuristic__consistent(self):
+        for i in range(5):
+            G = GraphGenerator.random_weighted_graph(100, 0.03, 50)
+            landmarks = Landmarks.preprocess(G, 4)
+            target = random.choice(G.nodes())
+
+            heuristic = landmarks.get_heuristic(target)
+            reverse_heuristic = landmarks.get_heuristic(target, reverse=True)
+            expected_dist = nx.shortest_path_length(G, target=target, weight="weight")
+
+            for u, v, d in G.edges(data=True):
+                self.assertTrue(heuristic(u) <= d['weight'] + heuristic(v))
+                self.assertTrue(reverse_heuristic(v) <= d['weight'] + reverse_heuristic(u))
+            for node in G.nodes():
+                if node not in expected_dist:
+                    continue
+                self.assertTrue(heuristic(node) <= expected_dist[node])
+
+    def test_st_shortest_path_astar(self):
+        (G, dic) = GraphGenerator.random_weighted_labeled_grid(15, 15, 50)
+        landmarks = Landmarks.preprocess(G, 4)
+        nodes = G.nodes()
+
+        for source, target in zip(random.sample(nodes, 5), random.sample(nodes, 5)):
+            heuristic = landmarks.get_heuristic(target)
+
+            expected_dist = nx.shortest_path_length(G, source, target, weight="weight")
+            (dist, path) = Dijkstra.st_shortest_path_astar(G, source, target, heuristic)
+
+            self.assertEqual(dist, expected_dist)
+
+    def test_st_reg_shortest_path_astar(self):
+        sigma = ['a', 'b']
+        (G, dic) = GraphGenerator.random_weighted_labeled_grid(15, 15, 50, sigma)
+        landmarks = Landmarks.preprocess(G, 4)
+        string = "(b+bab)*+a*"
+
+        while True:
+            source = random.choice(G.nodes())
+            target = random.choice(G.nodes())
+            heuristic = landmarks.get_heuristic(target)
+
+            try:
+                (dist, path) = REGLanguage.st_reg_shortest_path__astar(G, source, target, string, heuristic)
+                (expected_dist, expected_path) = REGLanguage.st_reg_shortest_path(G, source, target, string)
+            except nx.NetworkXNoPath:
+                continue
+
+            self.assertEqual(dist, expected_dist)
+            break
+
+    def test_st_shortest_path_astar__dead_ends(self):
+        sigma = ['a', 'b']
+        G = GraphGenerator.random_weighted_graph(100, 0.03, 50)
+        G = GraphGenerator.random_label(G, sigma)
+        landmarks = Landmarks.preprocess(G, 4)
+        string = "(a+b)*"
+        nodes = G.nodes()
+
+        for i in range(50):
+            source = random.choice(nodes)
+            target = random.choice(nodes)
+            heuristic = landmarks.get_heuristic(target)
+
+            try:
+                expected_dist = nx.shortest_path_length(G, source, target, weight="weight")
+            except nx.NetworkXNoPath:
+                self.assertRaises(nx.NetworkXNoPath, Dijkstra.st_shortest_path_astar, G, source, target, heuristic)
+                self.assertRaises(nx.NetworkXNoPath, REGLanguage.st_reg_shortest_path__astar, G, source, target,
+                                  string, heuristic)
+                continue
+
+            (dist, path) = Dijkstra.st_shortest_path_astar(G, source, target, heuristic)
+            self.assertEqual(dist, expected_dist)
+            if source != target:
+                (dist, path) = REGLanguage.st_reg_shortest_path__astar(G, source, target, string, heuristic)
+                self.assertEqual(dist, expected_dist)
+
+    def test_save_load(self):
+        G = GraphGenerator.random_weighted_graph(50, 0.1, 50)
+        landmarks = Landmarks.preprocess(G, 2)
+
+        (handle, filename) = tempfile.mkstemp()
+        os.close(handle)
+        try:
+            landmarks.save(filename)
+            loaded = Landmarks.load(filename)
+        finally:
+            os.remove(filename)
+
+        self.assertEqual(loaded.nodes, landmarks.nodes)
+        self.assertEqual(loaded.landmarks, landmarks.landmarks)
+        self.assertEqual(loaded.forward, landmarks.forward)
+        self.assertEqual(loaded.backward, landmarks.backward)
+        self.assertEqual(loaded.index, landmarks.index)
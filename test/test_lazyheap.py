@@ -0,0 +1,80 @@
+import unittest
+import random
+from lazyheap import LazyHeap
+
+
+class TestLazyHeap(unittest.TestCase):
+
+    def test_init(self):
+        heap = LazyHeap()
+
+        self.assertEqual(heap.heapList, [])
+        self.assertEqual(heap.currentSize, 0)
+        self.assertEqual(heap.key, {})
+
+    def test_insert(self):
+        heap = LazyHeap()
+
+        heap.insert(1, 10)
+        self.assertEqual(heap.currentSize, 1)
+        self.assertEqual(heap.key, {1: 10})
+        self.assertEqual(heap.findMin(), 1)
+
+    def test_insert__tuple(self):
+        heap = LazyHeap()
+
+        heap.insert((1, 2), 10)
+        self.assertEqual(heap.currentSize, 1)
+        self.assertEqual(heap.key, {(1, 2): 10})
+        self.assertEqual(heap.findMin(), (1, 2))
+
+    def test_extractMin(self):
+        heap = LazyHeap()
+        heap.insert(1, 10)
+
+        min = heap.extractMin()
+        self.assertEqual(heap.currentSize, 0)
+        self.assertEqual(heap.key, {1: 10})
+        self.assertEqual(min, 1)
+
+    def test_extractMin__order(self):
+        heap = LazyHeap()
+
+        alist = [11, 90, 72, 45, 3]
+        i = 1
+        for key in alist:
+            heap.insert(i, key)
+            i = i + 1
+
+        self.assertEqual(heap.currentSize, 5)
+        self.assertEqual([heap.extractMin() for i in range(5)], [5, 1, 4, 3, 2])
+        self.assertEqual(heap.currentSize, 0)
+
+    def test_decreaseKey(self):
+        heap = LazyHeap()
+        heap.insert(1, 10)
+        heap.insert(2, 8)
+
+        heap.decreaseKey(1, 5)
+        self.assertEqual(heap.currentSize, 2)
+        self.assertEqual(heap.key, {1: 5, 2: 8})
+        self.assertEqual(heap.findMin(), 1)
+        self.assertEqual(heap.extractMin(), 1)
+        self.assertEqual(heap.extractMin(), 2)
+        self.assertEqual(heap.currentSize, 0)
+
+    def test_random(self):
+        heap = LazyHeap()
+        keys = dict()
+        for element in range(200):
+            keys[element] = random.randint(1, 1000)
+            heap.insert(element, keys[element])
+        for element in random.sample(range(200), 50):
+            keys[element] = keys[element] - random.randint(0, keys[element])
+            heap.decreaseKey(element, keys[element])
+
+        extracted = []
+        while heap.currentSize > 0:
+            extracted.append(keys[heap.extractMin()])
+
+        self.assertEqual(extracted, sorted(keys.values()))
@@ -0,0 +1,86 @@
+import unittest
+import random
+from radixheap import RadixHeap
+
+
+class TestRadixHeap(unittest.TestCase):
+
+    def test_init(self):
+        heap = RadixHeap()
+
+        self.assertEqual(heap.currentSize, 0)
+        self.assertEqual(heap.key, {})
+        self.assertTrue(heap.integer)
+
+    def test_insert(self):
+        heap = RadixHeap()
+
+        heap.insert(1, 10)
+        self.assertEqual(heap.currentSize, 1)
+        self.assertEqual(heap.key, {1: 10})
+        self.assertEqual(heap.findMin(), 1)
+        self.assertEqual(heap.last, 10)
+
+    def test_extractMin__order(self):
+        heap = RadixHeap()
+
+        alist = [11, 90, 72, 45, 3]
+        i = 1
+        for key in alist:
+            heap.insert(i, key)
+            i = i + 1
+
+        self.assertEqual([heap.extractMin() for i in range(5)], [5, 1, 4, 3, 2])
+        self.assertEqual(heap.currentSize, 0)
+        self.assertTrue(heap.integer)
+
+    def test_decreaseKey(self):
+        heap = RadixHeap()
+        heap.insert(1, 10)
+        heap.insert(2, 8)
+
+        heap.decreaseKey(1, 5)
+        self.assertEqual(heap.key, {1: 5, 2: 8})
+        self.assertEqual(heap.extractMin(), 1)
+        self.assertEqual(heap.extractMin(), 2)
+        self.assertEqual(heap.currentSize, 0)
+
+    def test_fallback__float(self):
+        heap = RadixHeap()
+        heap.insert(1, 10)
+        heap.insert(2, 2.5)
+
+        self.assertFalse(heap.integer)
+        self.assertEqual(heap.extractMin(), 2)
+        self.assertEqual(heap.extractMin(), 1)
+
+    def test_fallback__not_monotone(self):
+        heap = RadixHeap()
+        heap.insert(1, 10)
+        heap.insert(2, 20)
+        self.assertEqual(heap.extractMin(), 1)
+
+        heap.insert(3, 5)
+
+        self.assertFalse(heap.integer)
+        self.assertEqual(heap.extractMin(), 3)
+        self.assertEqual(heap.extractMin(), 2)
+
+    def test_random(self):
+        heap = RadixHeap()
+        keys = dict()
+        extracted = []
+        last = 0
+        for element in range(500):
+            keys[element] = last + random.randint(0, 1000)
+            heap.insert(element, keys[element])
+            if random.random() < 0.3:
+                min = heap.extractMin()
+                extracted.append(keys[min])
+                last = keys[min]
+        while heap.currentSize > 0:
+            extracted.append(keys[heap.extractMin()])
+
+        self.assertTrue(heap.integer)
+        self.assertEqual(len(extracted), 500)
+        self.assertEqual(extracted, sorted(extracted))
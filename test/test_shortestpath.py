@@ -1,9 +1,11 @@
 import unittest
 import networkx as nx
 import random
-from graph import GraphGenerator
+from graph import GraphGenerator, GraphHelper
 from reader import Reader
 from shortestpath import Dijkstra, DAGraph, SPGraph
+from lazyheap import LazyHeap
+from radixheap import RadixHeap
 
 
 class TestDijkstra(unittest.TestCase):
@@ -24,6 +26,44 @@ class TestDijkstra(unittest.TestCase):
             if node in pred:
                 self.assertEqual(pred[node], expected_pred[node][-2])
 
+    def test_s_shortest_path__lazyheap(self):
+        G = GraphGenerator.random_weighted_graph(100, 0.03, 50)
+        nodes = G.nodes()
+
+        source = random.choice(nodes)
+
+        expected_dist = nx.shortest_path_length(G, source=source, weight="weight")
+        (dist, pred) = Dijkstra.s_shortest_path(G, source, LazyHeap)
+
+        self.assertEqual(dist, expected_dist)
+        for node in pred:
+            self.assertEqual(dist[node], dist[pred[node]] + G[pred[node]][node]['weight'])
+
+    def test_s_shortest_path_heap__radixheap(self):
+        G = GraphGenerator.random_weighted_graph(100, 0.03, 50)
+        nodes = G.nodes()
+
+        source = random.choice(nodes)
+
+        expected_dist = nx.shortest_path_length(G, source=source, weight="weight")
+        (dist, pred) = Dijkstra.s_shortest_path_heap(G, source, RadixHeap)
+
+        self.assertEqual(dist, expected_dist)
+
+    def test_s_shortest_path_heap__radixheap_float_weights(self):
+        G = GraphGenerator.random_weighted_graph(100, 0.03, 50)
+        for u, v, d in G.edges(data=True):
+            d['weight'] = d['weight'] / 7.0
+        nodes = G.nodes()
+
+        source = random.choice(nodes)
+
+        expected_dist = nx.shortest_path_length(G, source=source, weight="weight")
+        (dist, pred) = Dijkstra.s_shortest_path_heap(G, source, RadixHeap)
+
+        for node in expected_dist:
+            self.assertAlmostEqual(dist[node], expected_dist[node])
+
     def test_s_shortest_path__multidigraph(self):
         G = GraphGenerator.random_weighted_spg(100, 50)
         nodes = G.nodes()
@@ -169,6 +209,50 @@ class TestDijkstra(unittest.TestCase):
             self.assertEqual(path, expected_path)
             self.assertEqual(error, expected_error)
 
+    def test_st_shortest_path_heap__lazyheap(self):
+        G = GraphGenerator.random_weighted_graph(100, 0.03, 50)
+        nodes = G.nodes()
+
+        for source, target in zip(random.sample(nodes, 5), random.sample(nodes, 5)):
+            expected_dist = 0
+            expected_error = 0
+            try:
+                expected_dist = nx.shortest_path_length(G, source, target, weight="weight")
+            except nx.NetworkXNoPath:
+                expected_error = 1
+
+            dist = 0
+            error = 0
+            try:
+                (dist, path) = Dijkstra.st_shortest_path_heap(G, source, target, LazyHeap)
+            except nx.NetworkXNoPath:
+                error = 1
+
+            self.assertEqual(dist, expected_dist)
+            self.assertEqual(error, expected_error)
+
+    def test_st_shortest_path_heap__radixheap(self):
+        G = GraphGenerator.random_weighted_graph(100, 0.03, 50)
+        nodes = G.nodes()
+
+        for source, target in zip(random.sample(nodes, 5), random.sample(nodes, 5)):
+            expected_dist = 0
+            expected_error = 0
+            try:
+                expected_dist = nx.shortest_path_length(G, source, target, weight="weight")
+            except nx.NetworkXNoPath:
+                expected_error = 1
+
+            dist = 0
+            error = 0
+            try:
+                (dist, path) = Dijkstra.st_shortest_path_heap(G, source, target, RadixHeap)
+            except nx.NetworkXNoPath:
+                error = 1
+
+            self.assertEqual(dist, expected_dist)
+            self.assertEqual(error, expected_error)
+
     def test_st_shortest_path_heap__source_is_target(self):
         G = GraphGenerator.random_weighted_graph(100, 0.03, 50)
         source = random.choice(G.nodes())
@@ -281,6 +365,51 @@ class TestDijkstra(unittest.TestCase):
             self.assertEqual(path, expected_path)
             self.assertEqual(error, expected_error)
 
+    def test_st_shortest_path_heap__targets(self):
+        G = GraphGenerator.random_weighted_graph(100, 0.03, 50)
+        nodes = nx.nodes(G)
+        source = random.choice(nodes)
+        targets = random.sample(nodes, 5)
+
+        expected_dist = nx.shortest_path_length(G, source=source, weight="weight")
+        reachable = [target for target in targets if target in expected_dist]
+
+        dist = 0
+        path = []
+        error = 0
+        try:
+            (dist, path) = Dijkstra.st_shortest_path_heap__targets(G, source, targets)
+        except nx.NetworkXNoPath:
+            error = 1
+
+        if reachable:
+            self.assertEqual(error, 0)
+            self.assertEqual(dist, min([expected_dist[target] for target in reachable]))
+            self.assertEqual(path[0], source)
+            self.assertTrue(path[-1] in targets)
+            self.assertEqual(dist, sum([G[u][v]['weight'] for u, v in zip(path[:-1], path[1:])]))
+        else:
+            self.assertEqual(error, 1)
+
+    def test_st_shortest_path_astar(self):
+        (G, dic) = GraphGenerator.random_weighted_labeled_grid(20, 20, 50)
+        G = GraphHelper.make_graph_geometric(G, dict([(node, (10 * x, 10 * y)) for node, (x, y) in dic.items()]))
+        scale = GraphHelper.get_min_weight_per_distance(G, dic)
+        nodes = G.nodes()
+        sources = random.sample(nodes, 5)
+        targets = random.sample(nodes, 5)
+
+        for source, target in zip(sources, targets):
+            heuristic = GraphHelper.get_euclidean_heuristic(dic, target, scale)
+
+            expected_dist = nx.shortest_path_length(G, source, target, weight="weight")
+            (dist, path) = Dijkstra.st_shortest_path_astar(G, source, target, heuristic)
+
+            self.assertEqual(dist, expected_dist)
+            self.assertEqual(path[0], source)
+            self.assertEqual(path[-1], target)
+            self.assertEqual(dist, sum([G[u][v]['weight'] for u, v in zip(path[:-1], path[1:])]))
+
     def test_st_shortest_path_heap__NY(self):
         [G, dic] = Reader.convert_to_graph('USA-road-d.NY')
 
@@ -381,6 +510,38 @@ class TestSPGraph(unittest.TestCase):
             self.assertEqual(path, expected_path)
             self.assertEqual(error, expected_error)
 
+    def test_st_shortest_path__tree(self):
+        G = GraphGenerator.random_weighted_spg(300, 50)
+        number_of_edges = G.number_of_edges()
+        tree = GraphHelper.get_sp_tree(G)
+
+        pairs = [(tree.source, tree.sink)]
+        for i in range(10):
+            pairs.append((random.choice(G.nodes()), random.choice(G.nodes())))
+
+        for (source, target) in pairs:
+            expected_dist = None
+            try:
+                expected_dist = nx.shortest_path_length(G, source, target, weight="weight")
+            except nx.NetworkXNoPath:
+                pass
+
+            try:
+                (dist, path) = SPGraph.st_shortest_path__tree(G, source, target)
+            except nx.NetworkXNoPath:
+                self.assertEqual(expected_dist, None)
+                continue
+
+            self.assertEqual(dist, expected_dist)
+            self.assertEqual(path[0], source)
+            self.assertEqual(path[-1], target)
+            weight = 0
+            for u, v in zip(path[:-1], path[1:]):
+                weight += min([data['weight'] for data in G[u][v].values()])
+            self.assertEqual(weight, dist)
+
+        self.assertEqual(G.number_of_edges(), number_of_edges)
+
     def test_st_shortest_path__source_is_target(self):
         G = GraphGenerator.random_weighted_spg(100, 50)
         source = random.choice(G.nodes())